@@ -2,17 +2,50 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any
 
 
+_TRUE_STRINGS = frozenset(("true", "yes", "on", "1"))
+_FALSE_STRINGS = frozenset(("false", "no", "off", "0", ""))
+
+
+def as_bool(value: Any) -> bool:
+    """YAML / 画面入力の真偽値を bool にする。"false" のような文字列も偽として扱う。
+
+    解釈できない値なら ValueError を投げる。
+    """
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE_STRINGS:
+        return True
+    if text in _FALSE_STRINGS:
+        return False
+    raise ValueError(f"真偽値として解釈できません: {value!r}（true / false で指定してください）")
+
+
 class ActionBase(ABC):
     """Base class for all RPA actions.
 
     Each concrete action must provide:
       - id: a unique string identifier (e.g. "print", "file.copy")
       - execute(context, params)
+
+    Optionally, prepare_params(params) can validate/convert params once
+    before the flow starts (the engine passes its result to execute).
     """
 
     # Override in subclasses
     id: str = "base"
 
+    # インスタンス属性を持たない（サブクラスも __slots__ = () を宣言する）
+    __slots__ = ()
+
+    def prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """フロー開始前に1回だけ呼ばれる。params を検証・変換して返す（既定はそのまま）。"""
+        return params
+
     @abstractmethod
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         raise NotImplementedError
@@ -1,7 +1,144 @@
-from typing import Dict, Any
-import webbrowser
+from typing import Dict, Any, Callable, Optional, Tuple
+from concurrent.futures import Future
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
 
 from avantixrpa.actions.base import ActionBase
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
+
+
+class _BrowserPool:
+    """Playwright の Chromium を1つだけ起動しておき、URL ごとに新しいタブで開く。
+
+    Playwright の sync API は起動したスレッドからしか触れないので、
+    専用のワーカースレッドに処理を投げて結果を待つ。
+    """
+
+    def __init__(self) -> None:
+        self._jobs: "queue.Queue[Tuple[Callable[[], Any], Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._context: Any = None
+
+    def _worker(self) -> None:
+        while True:
+            fn, fut = self._jobs.get()
+            try:
+                fut.set_result(fn())
+            except BaseException as exc:  # noqa: BLE001
+                fut.set_exception(exc)
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="avantixrpa-browser", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+        fut: Future = Future()
+        self._jobs.put((fn, fut))
+        return fut.result()
+
+    def _open(self, url: str) -> None:
+        if self._context is None:
+            from playwright.sync_api import sync_playwright
+
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=False)
+            self._context = self._browser.new_context()
+        page = self._context.new_page()
+        page.goto(url)
+
+    def _close(self) -> None:
+        if self._browser is not None:
+            self._browser.close()
+        if self._playwright is not None:
+            self._playwright.stop()
+        self._context = self._browser = self._playwright = None
+
+    def open(self, url: str) -> None:
+        self._call(lambda: self._open(url))
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        try:
+            self._call(self._close)
+        except Exception:
+            pass
+
+
+_browser_pool = _BrowserPool()
+
+
+def _playwright_available() -> bool:
+    try:
+        import playwright.sync_api  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _resolve_default_opener() -> Optional[Callable[[str], None]]:
+    """OS の「既定のアプリで開く」を直接呼ぶ関数を返す（見つからなければ None）。"""
+    if sys.platform == "win32":
+        # ShellExecuteW そのもの
+        return os.startfile  # type: ignore[attr-defined]
+
+    exe = shutil.which("open" if sys.platform == "darwin" else "xdg-open")
+    if exe is None:
+        return None
+
+    def _open(url: str) -> None:
+        subprocess.Popen([exe, url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    return _open
+
+
+# プラットフォーム判定は import 時に 1 回だけ
+_default_opener = _resolve_default_opener()
+
+
+def open_url(url: str, browser: Optional[str] = None) -> bool:
+    """URL を開く。
+
+    - browser 省略時: OS の既定ブラウザを直接起動する（webbrowser モジュールを通さない）
+    - browser="playwright": 起動済みの Chromium を使い回す（未インストールなら既定ブラウザ）
+    - それ以外の名前（"chrome" など）: webbrowser モジュールで指定ブラウザを開く
+    """
+    if browser == "playwright":
+        if _playwright_available():
+            _browser_pool.open(url)
+            return True
+        _log.warning("playwright がインストールされていないため、デフォルトブラウザで開きます")
+        browser = None
+
+    if not browser and _default_opener is not None:
+        try:
+            _default_opener(url)
+        except OSError as exc:
+            _log.warning(f"既定のブラウザを起動できませんでした: {exc}")
+            return False
+        return True
+
+    import webbrowser  # ブラウザ指定時・既定の起動方法が無いときだけ読み込む
+
+    if browser:
+        try:
+            return webbrowser.get(browser).open(url, new=2)
+        except webbrowser.Error:
+            _log.warning(f"ブラウザ '{browser}' が見つからないため、デフォルトブラウザで開きます")
+
+    # new=2: 新しいタブで開く（対応ブラウザなら）
+    return webbrowser.open(url, new=2)
 
 
 class BrowserOpenAction(ActionBase):
@@ -11,22 +148,23 @@ class BrowserOpenAction(ActionBase):
       - action: browser.open
         params:
           url: "https://www.google.com"
+          browser: "chrome"       # 任意。省略時は既定ブラウザ / "playwright" で常駐 Chromium
     """
 
     id = "browser.open"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         url = params.get("url")
         if not url:
             raise ValueError("browser.open には 'url' パラメータが必要です")
 
-        # 将来ブラウザ指定したくなったとき用の予約パラメータ
-        browser_name = params.get("browser")  # 例: "chrome"（今は未使用）
+        # 省略時はデフォルトブラウザ。"playwright" なら常駐ブラウザのタブで開く（open_url 参照）
+        browser_name = params.get("browser")
 
-        print(f"[RPA] ブラウザでURLを開きます: {url}")
+        _log.info(f"ブラウザでURLを開きます: {url}")
 
-        # シンプルにデフォルトブラウザで開く
-        opened = webbrowser.open(url, new=2)  # new=2: 新しいタブで開く（対応ブラウザなら）
+        opened = open_url(url, browser_name)
 
         if not opened:
             # 一応失敗検知できる可能性はあるが、環境依存なので軽めにエラー扱い
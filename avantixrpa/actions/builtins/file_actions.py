@@ -1,8 +1,21 @@
 from typing import Dict, Any
+import os
 import shutil
 
-from avantixrpa.actions.base import ActionBase
-from avantixrpa.config.paths import expand_path
+from avantixrpa.actions.base import ActionBase, as_bool
+from avantixrpa.config.paths import expand_path_str
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
+
+
+def _ensure_parent(path: str, context: Dict[str, Any]) -> None:
+    """path の親フォルダを作成する。同じフロー実行中に作成済みのフォルダはスキップする。"""
+    parent = os.path.dirname(path)
+    ensured = context.setdefault("_mkdir_cache", set())
+    if parent not in ensured:
+        os.makedirs(parent, exist_ok=True)
+        ensured.add(parent)
 
 
 class FileCopyAction(ActionBase):
@@ -13,9 +26,20 @@ class FileCopyAction(ActionBase):
         params:
           src: "{AVANTIX_ROOT}/test_data/source/sample_log.txt"
           dst: "{DESKTOP}/AVANTIX_BACKUP/sample_log_backup.txt"
+          preserve_metadata: false   # 任意。true で更新日時などもコピー（copy2）
+
+    既定では中身だけをコピーする（shutil.copyfile）。
+    POSIX ではカーネル内コピー（sendfile / copy_file_range）が使われる。
     """
 
     id = "file.copy"
+    __slots__ = ()
+
+    def prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = dict(params)
+        # 引用符付きの "false" で copy2 にならないよう、ここで bool にしておく
+        prepared["preserve_metadata"] = as_bool(params.get("preserve_metadata", False))
+        return prepared
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         src = params.get("src")
@@ -23,18 +47,26 @@ class FileCopyAction(ActionBase):
         if not src or not dst:
             raise ValueError("file.copy には 'src' と 'dst' が必要です")
 
-        src_path = expand_path(str(src))
-        dst_path = expand_path(str(dst))
+        src_path = expand_path_str(str(src))
+        dst_path = expand_path_str(str(dst))
+
+        # shutil.copy2 と同様、コピー先がフォルダならその中に同名で置く
+        if os.path.isdir(dst_path):
+            dst_path = os.path.join(dst_path, os.path.basename(src_path))
 
-        print(f"[RPA] Copying {src_path} -> {dst_path}")
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_path, dst_path)
+        _log.info(f"Copying {src_path} -> {dst_path}")
+        _ensure_parent(dst_path, context)
+        if params["preserve_metadata"]:
+            shutil.copy2(src_path, dst_path)
+        else:
+            shutil.copyfile(src_path, dst_path)
 
 
 class FileMoveAction(ActionBase):
     """ファイル移動アクション。"""
 
     id = "file.move"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         src = params.get("src")
@@ -42,9 +74,9 @@ class FileMoveAction(ActionBase):
         if not src or not dst:
             raise ValueError("file.move には 'src' と 'dst' が必要です")
 
-        src_path = expand_path(str(src))
-        dst_path = expand_path(str(dst))
+        src_path = expand_path_str(str(src))
+        dst_path = expand_path_str(str(dst))
 
-        print(f"[RPA] Moving {src_path} -> {dst_path}")
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        _log.info(f"Moving {src_path} -> {dst_path}")
+        _ensure_parent(dst_path, context)
         shutil.move(src_path, dst_path)
@@ -1,13 +1,17 @@
 from typing import Dict, Any
 from avantixrpa.actions.base import ActionBase
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
 
 
 class PrintAction(ActionBase):
-    """Prints a message to stdout."""
+    """Writes a message to the log (console and logs/avantixrpa.log)."""
 
     id = "print"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         prefix = params.get("prefix", "[RPA]")
         message = params.get("message", "")
-        print(f"{prefix} {message}")
+        _log.info(f"{prefix} {message}")
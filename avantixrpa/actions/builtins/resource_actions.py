@@ -3,56 +3,81 @@ from __future__ import annotations
 
 import json
 import os
-import webbrowser
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 
 from ..base import ActionBase
+from .browser_actions import open_url
 
 from avantixrpa.config.paths import CONFIG_DIR, RESOURCES_FILE
 # リソースファイル（config.paths と共有）
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
+
+# resources.json の正規化済みキャッシュ: ((st_mtime_ns, st_size), data)
+_RESOURCES_CACHE: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+_RESOURCES_LOCK = threading.Lock()
 
 
 def _load_resources() -> Dict[str, Any]:
-    """UI側と同じ resources.json を読み込む。古い形式(string)と新形式(dict)の両方に対応。"""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    if not RESOURCES_FILE.exists():
+    """UI側と同じ resources.json を読み込む。古い形式(string)と新形式(dict)の両方に対応。
+
+    ファイルの (更新時刻, サイズ) が変わっていなければ、前回の正規化結果をそのまま返す。
+    """
+    global _RESOURCES_CACHE
+
+    try:
+        st = RESOURCES_FILE.stat()
+    except FileNotFoundError:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         return {"sites": {}, "files": {}}
 
+    token = (st.st_mtime_ns, st.st_size)
+
+    with _RESOURCES_LOCK:
+        cached = _RESOURCES_CACHE
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
+        data = _parse_resources()
+        _RESOURCES_CACHE = (token, data)
+        return data
+
+
+def _normalize_entries(raw: Any, value_key: str) -> Dict[str, Dict[str, str]]:
+    """{key: "値"} / {key: {label, <value_key>}} を {key: {label, <value_key>}} に揃える。"""
+    if not isinstance(raw, dict):
+        return {}
+    return {
+        key: (
+            {"label": key, value_key: v}
+            if isinstance(v, str)
+            else {"label": v.get("label") or key, value_key: v.get(value_key) or ""}
+        )
+        for key, v in raw.items()
+        if isinstance(v, (str, dict))
+    }
+
+
+def _parse_resources() -> Dict[str, Any]:
+    """resources.json を実際に読み込んで {sites, files} に正規化する。"""
     with RESOURCES_FILE.open("r", encoding="utf-8") as f:
         data = json.load(f)
 
     if not isinstance(data, dict):
         return {"sites": {}, "files": {}}
 
-    sites_raw = data.get("sites", {})
-    files_raw = data.get("files", {})
-
-    sites: Dict[str, Dict[str, str]] = {}
-    if isinstance(sites_raw, dict):
-        for key, v in sites_raw.items():
-            if isinstance(v, str):
-                sites[key] = {"label": key, "url": v}
-            elif isinstance(v, dict):
-                url = v.get("url") or ""
-                label = v.get("label") or key
-                sites[key] = {"label": label, "url": url}
-
-    files: Dict[str, Dict[str, str]] = {}
-    if isinstance(files_raw, dict):
-        for key, v in files_raw.items():
-            if isinstance(v, str):
-                files[key] = {"label": key, "path": v}
-            elif isinstance(v, dict):
-                path = v.get("path") or ""
-                label = v.get("label") or key
-                files[key] = {"label": label, "path": path}
+    sites = _normalize_entries(data.get("sites", {}), "url")
+    files = _normalize_entries(data.get("files", {}), "path")
 
     return {"sites": sites, "files": files}
 
 
 class ResourceOpenSiteAction(ActionBase):
-    action_id = "resource.open_site"
+    id = "resource.open_site"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         key = params.get("key")
@@ -74,14 +99,15 @@ class ResourceOpenSiteAction(ActionBase):
         if not url:
             raise ValueError(f"サイト '{key}' の URL が空です。")
 
-        print(f"[RPA] 登録サイトを開きます: key={key}, url={url}")
-        opened = webbrowser.open(url, new=2)
+        _log.info(f"登録サイトを開きます: key={key}, url={url}")
+        opened = open_url(url, params.get("browser"))
         if not opened:
             raise RuntimeError(f"ブラウザで URL を開けませんでした: {url}")
 
 
 class ResourceOpenFileAction(ActionBase):
-    action_id = "resource.open_file"
+    id = "resource.open_file"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         key = params.get("key")
@@ -107,5 +133,5 @@ class ResourceOpenFileAction(ActionBase):
         if not p.exists():
             raise FileNotFoundError(f"登録ファイルが存在しません: {p}")
 
-        print(f"[RPA] 登録ファイルを開きます: key={key}, path={p}")
+        _log.info(f"登録ファイルを開きます: key={key}, path={p}")
         os.startfile(str(p))
\ No newline at end of file
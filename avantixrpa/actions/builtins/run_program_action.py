@@ -1,10 +1,46 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pathlib import Path
 import os
+import re
 import subprocess
 import shlex
 
 from avantixrpa.actions.base import ActionBase
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
+
+# program に区切り文字（\ または /）が含まれるか = パスとして書かれているか
+_HAS_SEP = re.compile(r"[\\/]").search
+
+# posix_spawnp で起動した子プロセスの pid（終了済みのものは次回起動時に回収する）
+_spawned_pids: List[int] = []
+
+
+def _reap_children() -> None:
+    """終了済みの子プロセスを回収してゾンビを残さないようにする。"""
+    for pid in list(_spawned_pids):
+        try:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            done = pid
+        if done:
+            _spawned_pids.remove(pid)
+
+
+def _spawn(cmd_list: List[str]) -> None:
+    """プログラムを起動して、終了は待たない（投げっぱなし）。
+
+    POSIX では fork せずに posix_spawnp で起動する。
+    Windows は CreateProcess 直呼びの subprocess.Popen のまま。
+    """
+    if os.name != "nt" and hasattr(os, "posix_spawnp"):
+        _reap_children()
+        pid = os.posix_spawnp(cmd_list[0], cmd_list, os.environ, setsid=True)
+        _spawned_pids.append(pid)
+        return
+
+    subprocess.Popen(cmd_list)
 
 
 class RunProgramAction(ActionBase):
@@ -15,14 +51,18 @@ class RunProgramAction(ActionBase):
         params:
           program: "notepad.exe"
           args: ""
+
+    args は文字列（シェル風に分割）でもリストでもよい:
+          args: ["--foo", "bar baz"]   # リストならそのまま引数として渡す
     """
 
     id = "run.program"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         # 新仕様: program + args
         program = params.get("program")
-        args_str = params.get("args") or ""
+        args_raw = params.get("args")
 
         # 旧仕様: command だけ（互換用）
         legacy_command = params.get("command")
@@ -34,28 +74,35 @@ class RunProgramAction(ActionBase):
         if program:
             program_str = str(program)
 
-            if args_str:
+            if isinstance(args_raw, (list, tuple)):
+                # 既に分割済みなら shlex を通さない
+                args_list = [str(a) for a in args_raw]
+            elif args_raw:
                 try:
-                    args_list = shlex.split(str(args_str))
+                    args_list = shlex.split(str(args_raw))
                 except ValueError:
-                    args_list = [str(args_str)]
+                    args_list = [str(args_raw)]
             else:
                 args_list = []
 
             p = Path(program_str)
+            suffix = p.suffix.lower()
+            has_sep = _HAS_SEP(program_str) is not None
+            # 存在確認（stat）は必要なときだけ 1 回にする
+            exists = p.exists() if has_sep or suffix == ".lnk" else False
 
             # 「パスとして書いてるくせに存在しない」場合は分かりやすく怒る
-            if any(sep in program_str for sep in ("\\", "/")) and not p.exists():
+            if has_sep and not exists:
                 raise FileNotFoundError(f"run.program: 指定されたパスが存在しません: {program_str}")
 
             # ★ .lnk (ショートカット) は os.startfile で開く
-            if p.suffix.lower() == ".lnk" and p.exists():
-                print(f"[RPA] ショートカットを起動します: {program_str}")
+            if suffix == ".lnk" and exists:
+                _log.info(f"ショートカットを起動します: {program_str}")
                 os.startfile(program_str)
                 return
 
             cmd_list = [program_str] + args_list
-            print(f"[RPA] プログラム起動: {' '.join(cmd_list)}")
-            subprocess.Popen(cmd_list)
+            _log.info(f"プログラム起動: {' '.join(cmd_list)}")
+            _spawn(cmd_list)
             return
 
@@ -1,23 +1,44 @@
-from typing import Dict, Any
+from typing import Any, Dict
 import time
 
-try:
-    import pyautogui
-except ImportError as e:
-    pyautogui = None
-    _import_error = e
-else:
-    _import_error = None
-
 from avantixrpa.actions.base import ActionBase
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
+
+
+# pyautogui は重い（Pillow などを引き込む）ので、UI 系ステップを含むフローを初めて準備するときに import する
+pyautogui: Any = None
 
 
 def _ensure_pyautogui():
+    global pyautogui
     if pyautogui is None:
-        raise RuntimeError(
-            "pyautogui がインストールされていません。"
-            " 'py -m pip install pyautogui' を実行してください。"
-        )
+        try:
+            import pyautogui as _pyautogui
+        except ImportError as e:
+            raise RuntimeError(
+                "pyautogui がインストールされていません。"
+                " 'py -m pip install pyautogui' を実行してください。"
+            ) from e
+        pyautogui = _pyautogui
+    return pyautogui
+
+
+class _PyAutoGuiAction(ActionBase):
+    """pyautogui を使うアクションの共通基底。
+
+    pyautogui の有無はフロー開始前の prepare_params で1回だけ確認するので、
+    execute ではモジュール変数 pyautogui をそのまま使ってよい。
+    未インストールなら RuntimeError になり、エンジンがそのステップの on_error に従って扱う
+    （continue なら execute は呼ばれず、実行時に同じエラーとして記録される）。
+    """
+
+    __slots__ = ()
+
+    def prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        _ensure_pyautogui()
+        return params
 
 
 def _handle_delay(params: Dict[str, Any]) -> None:
@@ -27,7 +48,7 @@ def _handle_delay(params: Dict[str, Any]) -> None:
         try:
             delay_sec = float(delay)
             if delay_sec > 0:
-                print(f"[RPA] 実行前待機: {delay_sec} 秒")
+                _log.info(f"実行前待機: {delay_sec} 秒")
                 time.sleep(delay_sec)
         except (TypeError, ValueError):
             pass
@@ -43,6 +64,7 @@ class PauseAction(ActionBase):
     """
 
     id = "pause"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         import tkinter as tk
@@ -50,7 +72,7 @@ class PauseAction(ActionBase):
 
         message = params.get("message", "準備ができたら「OK」を押してください")
 
-        print(f"[RPA] 一時停止: {message}")
+        _log.info(f"一時停止: {message}")
 
         # ダイアログを表示（最前面に、ちゃんと待機する）
         root = tk.Tk()
@@ -67,10 +89,10 @@ class PauseAction(ActionBase):
         )
         
         root.destroy()
-        print("[RPA] 再開します")
+        _log.info("再開します")
 
 
-class UiScrollAction(ActionBase):
+class UiScrollAction(_PyAutoGuiAction):
     """マウスホイールで画面をスクロールするアクション。
 
     例:
@@ -83,11 +105,10 @@ class UiScrollAction(ActionBase):
     """
 
     id = "ui.scroll"
+    __slots__ = ()
 
-    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
-        _ensure_pyautogui()
-        _handle_delay(params)
-
+    def prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        params = super().prepare_params(params)
         amount = params.get("amount")
         if amount is None:
             raise ValueError("ui.scroll には 'amount' パラメータが必要です（+で上 / -で下）")
@@ -100,15 +121,32 @@ class UiScrollAction(ActionBase):
         x = params.get("x")
         y = params.get("y")
 
+        prepared = dict(params)
+        prepared["amount"] = clicks
         if x is not None and y is not None:
-            print(f"[RPA] スクロール: amount={clicks}, x={x}, y={y}")
-            pyautogui.scroll(clicks, x=int(x), y=int(y))
+            prepared["x"] = int(x)
+            prepared["y"] = int(y)
         else:
-            print(f"[RPA] スクロール: amount={clicks}（現在のマウス位置）")
+            prepared["x"] = prepared["y"] = None
+        return prepared
+
+    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
+        _handle_delay(params)
+
+        # amount / x / y は prepare_params で int に変換済み
+        clicks = params["amount"]
+        x = params["x"]
+        y = params["y"]
+
+        if x is not None:
+            _log.info(f"スクロール: amount={clicks}, x={x}, y={y}")
+            pyautogui.scroll(clicks, x=x, y=y)
+        else:
+            _log.info(f"スクロール: amount={clicks}（現在のマウス位置）")
             pyautogui.scroll(clicks)
 
 
-class UiMoveAction(ActionBase):
+class UiMoveAction(_PyAutoGuiAction):
     """マウスカーソルを指定座標に移動するアクション。
 
     例:
@@ -121,23 +159,34 @@ class UiMoveAction(ActionBase):
     """
 
     id = "ui.move"
+    __slots__ = ()
 
-    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
-        _ensure_pyautogui()
-        _handle_delay(params)
-
+    def prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        params = super().prepare_params(params)
         x = params.get("x")
         y = params.get("y")
-        duration = float(params.get("duration", 0.0))
-
         if x is None or y is None:
             raise ValueError("ui.move には 'x', 'y' パラメータが必要です")
 
-        print(f"[RPA] マウス移動: x={x}, y={y}, duration={duration}")
-        pyautogui.moveTo(int(x), int(y), duration=duration)
+        prepared = dict(params)
+        prepared["x"] = int(x)
+        prepared["y"] = int(y)
+        prepared["duration"] = float(params.get("duration", 0.0))
+        return prepared
+
+    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
+        _handle_delay(params)
+
+        # x / y / duration は prepare_params で変換済み
+        x = params["x"]
+        y = params["y"]
+        duration = params["duration"]
+
+        _log.info(f"マウス移動: x={x}, y={y}, duration={duration}")
+        pyautogui.moveTo(x, y, duration=duration)
 
 
-class UiClickAction(ActionBase):
+class UiClickAction(_PyAutoGuiAction):
     """マウスクリックを行うアクション。
 
     例:
@@ -151,9 +200,9 @@ class UiClickAction(ActionBase):
     """
 
     id = "ui.click"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
-        _ensure_pyautogui()
         _handle_delay(params)
 
         x = params.get("x")
@@ -162,7 +211,7 @@ class UiClickAction(ActionBase):
         clicks = int(params.get("clicks", 1))
         interval = float(params.get("interval", 0.0))
 
-        print(f"[RPA] クリック: x={x}, y={y}, button={button}, clicks={clicks}")
+        _log.info(f"クリック: x={x}, y={y}, button={button}, clicks={clicks}")
 
         if x is not None and y is not None:
             pyautogui.click(int(x), int(y), clicks=clicks, interval=interval, button=button)
@@ -170,7 +219,7 @@ class UiClickAction(ActionBase):
             pyautogui.click(clicks=clicks, interval=interval, button=button)
 
 
-class UiTypeAction(ActionBase):
+class UiTypeAction(_PyAutoGuiAction):
     """キーボード入力を行うアクション。
 
     例:
@@ -181,20 +230,20 @@ class UiTypeAction(ActionBase):
     """
 
     id = "ui.type"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
-        _ensure_pyautogui()
         text = params.get("text")
         interval = float(params.get("interval", 0.0))
 
         if not text:
             raise ValueError("ui.type には 'text' パラメータが必要です")
 
-        print(f"[RPA] キーボード入力: {text!r}")
+        _log.info(f"キーボード入力: {text!r}")
         pyautogui.write(text, interval=interval)
 
 
-class UiHotkeyAction(ActionBase):
+class UiHotkeyAction(_PyAutoGuiAction):
     """ショートカットキー（ホットキー）を送信するアクション。
 
     例:
@@ -204,12 +253,21 @@ class UiHotkeyAction(ActionBase):
     """
 
     id = "ui.hotkey"
+    __slots__ = ()
 
-    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
-        _ensure_pyautogui()
+    def prepare_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        params = super().prepare_params(params)
         keys = params.get("keys")
         if not keys or not isinstance(keys, (list, tuple)):
             raise ValueError("ui.hotkey には 'keys' リストが必要です (例: ['ctrl', 's'])")
 
-        print(f"[RPA] ホットキー送信: {keys}")
-        pyautogui.hotkey(*keys)
\ No newline at end of file
+        prepared = dict(params)
+        prepared["keys"] = tuple(keys)
+        return prepared
+
+    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
+        # keys は prepare_params でタプルに検証済み
+        keys = params["keys"]
+
+        _log.info(f"ホットキー送信: {list(keys)}")
+        pyautogui.hotkey(*keys)
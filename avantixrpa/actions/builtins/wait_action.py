@@ -2,14 +2,18 @@ from typing import Dict, Any
 import time
 
 from avantixrpa.actions.base import ActionBase
+from avantixrpa.logging.logger import get_logger
+
+_log = get_logger("avantixrpa.actions")
 
 
 class WaitAction(ActionBase):
     """Sleeps for a given number of seconds."""
 
     id = "wait"
+    __slots__ = ()
 
     def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
         seconds = float(params.get("seconds", 1))
-        print(f"[RPA] Waiting {seconds} seconds...")
+        _log.info(f"Waiting {seconds} seconds...")
         time.sleep(seconds)
@@ -11,8 +11,13 @@ def build_actions_registry() -> Dict[str, Type[ActionBase]]:
     """Collect all available actions.
 
     Later this can be extended to scan plugins/ dynamically.
+    Each class's ``id`` must match its registry key.
     """
-    return dict(BUILTIN_ACTIONS)
+    registry = dict(BUILTIN_ACTIONS)
+    for key, cls in registry.items():
+        if cls.id != key:
+            raise ValueError(f"Action id mismatch: key={key!r}, {cls.__name__}.id={cls.id!r}")
+    return registry
 
 
 def main() -> int:
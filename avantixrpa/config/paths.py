@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 import os
+import re
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Pattern
 
 # プロジェクトルート（AVANTIXRPA のルートフォルダ）
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -14,21 +15,37 @@ LOGS_DIR = PROJECT_ROOT / "logs"
 RUNS_DIR = PROJECT_ROOT / "runs"
 RESOURCES_FILE = CONFIG_DIR / "resources.json"
 
-# env.local.json キャッシュ
-_ENV_CACHE: Dict[str, Any] | None = None
+_ENV_FILE = CONFIG_DIR / "env.local.json"
 
+# env.local.json キャッシュ: ((st_mtime_ns, st_size) またはファイル無しなら None, data)
+_ENV_CACHE: tuple[tuple[int, int] | None, Dict[str, Any]] | None = None
 
-def _load_env() -> Dict[str, Any]:
-    """config/env.local.json を読み込む（あれば）。"""
+# 標準 + env.local.json をマージ済みのプレースホルダ キャッシュ:
+# (作ったときの env.local.json の token, プレースホルダ dict, \{(KEY1|KEY2|...)\} の正規表現)
+# dict と正規表現は必ずこのタプルごと取り出す（別々に取ると env.local.json の更新を挟んでずれる）
+_PLACEHOLDERS_CACHE: tuple[tuple[int, int] | None, Dict[str, str], Pattern[str]] | None = None
+
+
+def _load_env() -> tuple[tuple[int, int] | None, Dict[str, Any]]:
+    """config/env.local.json を読み込み（あれば）、(token, data) を返す。
+
+    (mtime, size) が変わっていなければキャッシュを返し、変わっていたら読み直す。
+    """
     global _ENV_CACHE
-    if _ENV_CACHE is not None:
-        return _ENV_CACHE
+    try:
+        st = _ENV_FILE.stat()
+        token: tuple[int, int] | None = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        token = None
+
+    cached = _ENV_CACHE
+    if cached is not None and cached[0] == token:
+        return cached
 
-    env_file = CONFIG_DIR / "env.local.json"
     data: Dict[str, Any] = {}
-    if env_file.exists():
+    if token is not None:
         try:
-            with env_file.open("r", encoding="utf-8") as f:
+            with _ENV_FILE.open("r", encoding="utf-8") as f:
                 loaded = json.load(f)
                 if isinstance(loaded, dict):
                     data = loaded
@@ -36,8 +53,9 @@ def _load_env() -> Dict[str, Any]:
             # env.local.json が壊れてても、とりあえず空として扱う
             data = {}
 
-    _ENV_CACHE = data
-    return data
+    entry = (token, data)
+    _ENV_CACHE = entry
+    return entry
 
 
 def _get_default_placeholders() -> Dict[str, str]:
@@ -56,6 +74,32 @@ def _get_default_placeholders() -> Dict[str, str]:
     }
 
 
+def _get_placeholder_table() -> tuple[tuple[int, int] | None, Dict[str, str], Pattern[str]]:
+    """標準プレースホルダに env.local.json の placeholders をマージした dict を、
+    (env.local.json の token, dict, 置換用の正規表現) のタプルで返す。
+
+    env.local.json が変わったとき（token が変わったとき）だけ作り直す。
+    """
+    global _PLACEHOLDERS_CACHE
+    token, env = _load_env()
+    cached = _PLACEHOLDERS_CACHE
+    if cached is not None and cached[0] == token:
+        return cached
+
+    placeholders = _get_default_placeholders()
+
+    # env.local.json の placeholders を上書き/追加
+    user_ph = env.get("placeholders") if isinstance(env, dict) else None
+    if isinstance(user_ph, dict):
+        for k, v in user_ph.items():
+            placeholders[str(k)] = str(v)
+
+    pattern = re.compile(r"\{(" + "|".join(map(re.escape, placeholders)) + r")\}")
+    entry = (token, placeholders, pattern)
+    _PLACEHOLDERS_CACHE = entry
+    return entry
+
+
 def expand_path(template: str) -> Path:
     """
     パス文字列に含まれる {PLACEHOLDER} を実行環境に合わせて展開して Path を返す。
@@ -76,24 +120,26 @@ def expand_path(template: str) -> Path:
 
       src: "{DATA_ROOT}/input.csv"
     """
-    if not template:
-        raise ValueError("expand_path に空のパス文字列が渡されました")
+    return Path(_substitute(template)).resolve()
 
-    env = _load_env()
-    placeholders = _get_default_placeholders()
 
-    # env.local.json の placeholders を上書き/追加
-    user_ph = env.get("placeholders") if isinstance(env, dict) else None
-    if isinstance(user_ph, dict):
-        for k, v in user_ph.items():
-            placeholders[str(k)] = str(v)
+def expand_path_str(template: str) -> str:
+    """expand_path の文字列版。
+
+    resolve()（シンボリックリンク解決のための stat）をせず、
+    絶対パス化と正規化だけを行う。パスを文字列として渡すだけの処理向け。
+    """
+    return os.path.abspath(_substitute(template))
 
-    result = str(template)
 
-    for key, value in placeholders.items():
-        token = "{" + key + "}"
-        if token in result:
-            result = result.replace(token, value)
+def _substitute(template: str) -> str:
+    """{PLACEHOLDER} と ~ を展開した文字列を返す。"""
+    if not template:
+        raise ValueError("expand_path に空のパス文字列が渡されました")
+
+    _, table, pattern = _get_placeholder_table()
+    # テンプレートを 1 回だけ走査して置換する（置換後の値に含まれる {...} は展開しない）
+    result = pattern.sub(lambda m: table[m.group(1)], str(template))
 
     # チルダ展開（~）も一応対応
-    return Path(os.path.expanduser(result)).resolve()
\ No newline at end of file
+    return os.path.expanduser(result)
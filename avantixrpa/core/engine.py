@@ -1,4 +1,5 @@
-from typing import Dict, Type, Optional, Any
+from typing import Dict, List, Type, Optional, Any, Tuple
+import logging
 import threading
 
 from avantixrpa.actions.base import ActionBase
@@ -10,6 +11,23 @@ class FlowStoppedException(Exception):
     pass
 
 
+class _DeferredPrepareError(ActionBase):
+    """prepare_params で失敗したステップの代わりに計画へ入れるプレースホルダ。
+
+    on_error が continue のステップは準備段階で失敗してもフロー全体を止めず、
+    そのステップの実行時に保存しておいた例外を投げて通常のエラー方針に任せる。
+    """
+
+    id = "deferred_error"
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: Exception) -> None:
+        self.exc = exc
+
+    def execute(self, context: Dict[str, Any], params: Dict[str, Any]) -> None:
+        raise self.exc
+
+
 class Engine:
     """Very small RPA engine that runs a flow definition dict.
 
@@ -31,6 +49,8 @@ class Engine:
 
     def __init__(self, actions: Dict[str, Type[ActionBase]]):
         self.actions = actions
+        # アクションはステートレスなので、ID ごとにインスタンスを使い回す
+        self._instances: Dict[str, ActionBase] = {}
         self.logger = get_logger("avantixrpa.engine")
         self.stop_event: Optional[threading.Event] = None  # ★ 中断用イベント
 
@@ -47,48 +67,38 @@ class Engine:
             raise ValueError("on_error must be 'stop' or 'continue'")
 
         msg = f"Start flow: {name} (on_error={flow_on_error})"
-        print(f"[ENGINE] {msg}")
         self.logger.info(msg)
 
         if not isinstance(steps, list):
             raise ValueError("flow_def['steps'] must be a list")
 
-        for idx, step in enumerate(steps, start=1):
+        # 実行前にアクションIDを解決・検証しておく（途中で未知のアクションに当たって止まらないように）
+        plan = self._compile_steps(steps, flow_on_error)
+
+        # ループ内で毎回引かないよう、よく使う属性をローカルに束縛しておく
+        stop_event = self.stop_event
+        log_info = self.logger.info
+        log_exception = self.logger.exception
+        info_enabled = self.logger.isEnabledFor(logging.INFO)
+
+        for idx, (action_id, action, params, step_policy) in enumerate(plan, start=1):
             # ★ 各ステップ実行前に中断チェック
-            if self.stop_event and self.stop_event.is_set():
+            if stop_event and stop_event.is_set():
                 stop_msg = f"Flow stopped by user at step {idx}"
-                print(f"[ENGINE] {stop_msg}")
-                self.logger.info(stop_msg)
+                log_info(stop_msg)
                 raise FlowStoppedException(stop_msg)
 
-            action_id = step.get("action")
-            params: dict = step.get("params") or {}
-
-            # ステップ単位のエラー方針
-            step_continue_flag = step.get("continue_on_error", False)
-            # True ならこのステップはエラーでも続行、それ以外はフローの on_error に従う
-            step_policy = "continue" if step_continue_flag else flow_on_error
-
-            step_msg = f"Step {idx}: {action_id} (on_error={step_policy})"
-            print(f"[ENGINE] {step_msg}")
-            self.logger.info(step_msg)
-
-            if action_id not in self.actions:
-                err = f"Unknown action: {action_id!r}"
-                self.logger.error(err)
-                raise ValueError(err)
-
-            action_cls = self.actions[action_id]
-            action = action_cls()
+            if info_enabled:
+                log_info(f"Step {idx}: {action_id} (on_error={step_policy})")
 
             try:
                 action.execute(context, params)
-                self.logger.info(f"Step {idx} completed: {action_id}")
+                if info_enabled:
+                    log_info(f"Step {idx} completed: {action_id}")
             except Exception as exc:  # noqa: BLE001
                 err = f"Step {idx} failed: {exc}"
-                print(f"[ENGINE] {err}")
                 # stack trace付き
-                self.logger.exception(err)
+                log_exception(err)
 
                 if step_policy == "continue":
                     # ログだけ吐いて次のステップへ
@@ -98,5 +108,47 @@ class Engine:
                 raise
 
         end_msg = "Flow finished"
-        print(f"[ENGINE] {end_msg}")
-        self.logger.info(end_msg)
\ No newline at end of file
+        self.logger.info(end_msg)
+
+    def _compile_steps(
+        self, steps: List[dict], flow_on_error: str
+    ) -> List[Tuple[str, ActionBase, dict, str]]:
+        """steps を (action_id, アクションインスタンス, params, エラー方針) のリストに変換する。
+
+        未知のアクションIDがあれば、どのステップも実行する前に ValueError を投げる。
+        prepare_params の失敗（不正な params、依存ライブラリ不足など）は、エラー方針が
+        stop のステップならその場で送出し、continue のステップなら実行時に同じ例外を
+        投げるプレースホルダを計画に入れる。
+        """
+        actions = self.actions
+        instances = self._instances
+        plan: List[Tuple[str, ActionBase, dict, str]] = []
+
+        for idx, step in enumerate(steps, start=1):
+            action_id = step.get("action")
+            params: dict = step.get("params") or {}
+
+            # ステップ単位のエラー方針
+            # True ならこのステップはエラーでも続行、それ以外はフローの on_error に従う
+            step_policy = "continue" if step.get("continue_on_error", False) else flow_on_error
+
+            action = instances.get(action_id)
+            if action is None:
+                if action_id not in actions:
+                    err = f"Unknown action: {action_id!r}"
+                    self.logger.error(err)
+                    raise ValueError(err)
+                action = instances.setdefault(action_id, actions[action_id]())
+
+            # パラメータの検証・型変換はここで1回だけ済ませておく
+            try:
+                params = action.prepare_params(params)
+            except Exception as exc:  # noqa: BLE001
+                self.logger.error(f"Step {idx} could not be prepared: {exc}")
+                if step_policy != "continue":
+                    raise
+                action = _DeferredPrepareError(exc)
+
+            plan.append((action_id, action, params, step_policy))
+
+        return plan
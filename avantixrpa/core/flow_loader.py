@@ -1,26 +1,67 @@
+from collections import OrderedDict
 from pathlib import Path
-from typing import Union
-import yaml  # Requires: pip install pyyaml
+from typing import Any, Tuple, Union
+import copy
+import threading
 
 from avantixrpa.config.paths import FLOWS_DIR
 
+# 読み込み済みフローのキャッシュ: resolve 済みパス -> ((st_mtime_ns, st_size), data)
+# 最近使った順に並べ、_FLOW_CACHE_MAX 件を超えたら古いものから捨てる
+_FLOW_CACHE: "OrderedDict[Path, Tuple[Tuple[int, int], dict]]" = OrderedDict()
+_FLOW_CACHE_MAX = 32
+_FLOW_CACHE_LOCK = threading.Lock()
+
+# (yaml.load, Loader クラス)。yaml の import はここだけで行う
+_YAML: Tuple[Any, Any] | None = None
+
+
+def _get_yaml_loader() -> Tuple[Any, Any]:
+    """(yaml.load, Loader) を返す。Loader は libyaml があれば CSafeLoader、なければ純 Python の SafeLoader。"""
+    global _YAML
+    if _YAML is None:
+        import yaml  # Requires: pip install pyyaml（使うときだけ読み込む）
+
+        _YAML = (yaml.load, getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    return _YAML
+
 
 def load_flow(path_or_name: Union[str, Path]) -> dict:
     """Load a YAML flow definition.
 
     If a relative path or name is given, it is resolved under FLOWS_DIR.
+    Parsed flows are cached by (mtime, size); each call returns a fresh copy.
     """
     p = Path(path_or_name)
     if not p.is_absolute():
         p = FLOWS_DIR / p
 
-    if not p.exists():
-        raise FileNotFoundError(f"Flow file not found: {p}")
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Flow file not found: {p}") from None
+
+    key = p.resolve()
+    token = (st.st_mtime_ns, st.st_size)
 
+    with _FLOW_CACHE_LOCK:
+        cached = _FLOW_CACHE.get(key)
+        if cached is not None:
+            _FLOW_CACHE.move_to_end(key)
+    if cached is not None and cached[0] == token:
+        return copy.deepcopy(cached[1])
+
+    yaml_load, loader = _get_yaml_loader()
     with p.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml_load(f, Loader=loader)
 
     if not isinstance(data, dict):
         raise ValueError("Flow definition root must be an object (mapping)")
 
-    return data
+    with _FLOW_CACHE_LOCK:
+        _FLOW_CACHE[key] = (token, data)
+        _FLOW_CACHE.move_to_end(key)
+        while len(_FLOW_CACHE) > _FLOW_CACHE_MAX:
+            _FLOW_CACHE.popitem(last=False)
+
+    return copy.deepcopy(data)
@@ -1,29 +1,38 @@
+import atexit
 import logging
-from pathlib import Path
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from avantixrpa.config.paths import LOGS_DIR
 
+LOGS_DIR.mkdir(parents=True, exist_ok=True)
+LOG_FILE = LOGS_DIR / "avantixrpa.log"
+
+# ファイル/コンソールへの書き出しはバックグラウンドスレッド（QueueListener）で行う。
+# 各ロガーには QueueHandler だけを付けるので、ステップ実行側はキューに積むだけで済む。
+_fmt = logging.Formatter(
+    "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+)
+
+_file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
+_file_handler.setFormatter(_fmt)
+
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_fmt)
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener = QueueListener(_log_queue, _file_handler, _stream_handler)
+_listener.start()
+# 終了時にキューに残っているログを書き切る
+atexit.register(_listener.stop)
 
-def get_logger(name: str = "avantixrpa") -> logging.Logger:
-    LOGS_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = LOGS_DIR / "avantixrpa.log"
 
+def get_logger(name: str = "avantixrpa") -> logging.Logger:
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
 
     logger.setLevel(logging.INFO)
-
-    fmt = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
-    )
-
-    fh = logging.FileHandler(log_file, encoding="utf-8")
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
-
-    ch = logging.StreamHandler()
-    ch.setFormatter(fmt)
-    logger.addHandler(ch)
+    logger.addHandler(QueueHandler(_log_queue))
 
     return logger
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import bisect
 import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, NamedTuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
+import os
 import shutil
 import zipfile
 import urllib.request
@@ -13,6 +18,7 @@ import html as html_lib
 import re
 import unicodedata
 from datetime import datetime
+from functools import lru_cache
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
@@ -26,12 +32,27 @@ except ImportError:
     DND_FILES = None   # type: ignore
     DND_AVAILABLE = False
 
+# --- resources.json の読み書き用 (orjson があれば使う / なければ標準の json) ---
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
 import yaml  # YAML から name を読む＆書く
 
+# libyaml（C 実装）があれば使う / なければ純 Python の Safe 版
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    YAML_C_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper  # type: ignore[assignment]
+    YAML_C_AVAILABLE = False
+
 from avantixrpa.core.flow_loader import load_flow
 from avantixrpa.core.engine import Engine, FlowStoppedException
 from avantixrpa.config.paths import FLOWS_DIR, CONFIG_DIR, RESOURCES_FILE
 from avantixrpa.actions.builtins import BUILTIN_ACTIONS
+from avantixrpa.actions.base import as_bool
 
 # パス定義（config.paths と共有）
 TRASH_DIR = FLOWS_DIR / ".trash"
@@ -45,6 +66,123 @@ SETTINGS_FILE = CONFIG_DIR / "settings.json"
 
 APP_COPYRIGHT = "© 2025 Toshiki Azuma. All rights reserved."
 
+# 実行ログをまとめて書き込む間隔（ミリ秒）
+_LOG_FLUSH_MS = 50
+
+# <title> 抽出用（デコード前のバイト列に対して使う）
+_TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+# タイトルは <head> にあるので、先頭だけを少しずつ読んで見つかったら打ち切る
+_TITLE_READ_CHUNK = 8192
+_TITLE_READ_LIMIT = 131072
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+# タイトル中の改行・連続空白を 1 つにまとめる
+_WS_RE = re.compile(r"\s+")
+# タイトル取得時はブラウザっぽい User-Agent を名乗る
+_TITLE_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0 Safari/537.36"
+    )
+}
+
+# --- タイトル取得の接続プール (urllib3 があれば keep-alive で使い回す / なければ urllib.request) ---
+_HTTP_POOL: Any = None
+_HTTP_POOL_CHECKED = False
+_HTTP_POOL_LOCK = threading.Lock()
+
+
+def _get_http_pool() -> Any:
+    """urllib3.PoolManager を初回だけ作って返す。urllib3 が無ければ None。"""
+    global _HTTP_POOL, _HTTP_POOL_CHECKED
+    with _HTTP_POOL_LOCK:
+        if not _HTTP_POOL_CHECKED:
+            _HTTP_POOL_CHECKED = True
+            try:
+                import urllib3  # type: ignore
+            except ImportError:
+                _HTTP_POOL = None
+            else:
+                _HTTP_POOL = urllib3.PoolManager(
+                    num_pools=8,
+                    timeout=5,
+                    # 接続/読み込みの再試行はしない。リダイレクトだけ追う
+                    retries=urllib3.Retry(total=5, connect=0, read=0, status=0, redirect=5),
+                    headers=_TITLE_HEADERS,
+                )
+        return _HTTP_POOL
+
+
+def _scan_title(resp: Any) -> tuple[Optional[re.Match[bytes]], bool]:
+    """レスポンスを少しずつ読んで <title> を探す。(マッチ, 最後まで読んだか) を返す。"""
+    buf = bytearray()
+    while len(buf) < _TITLE_READ_LIMIT:
+        chunk = resp.read(_TITLE_READ_CHUNK)
+        if not chunk:
+            return None, True
+        buf += chunk
+        # バイト列のまま探す（デコードは見つかった <title> の中身だけ）
+        m = _TITLE_RE.search(buf)
+        if m or _HEAD_END_RE.search(buf):
+            return m, False
+    return None, False
+
+
+@lru_cache(maxsize=128)
+def _fetch_title_cached(url: str) -> str:
+    """url の <title> を取ってくる。取れたタイトルだけ URL ごとに覚えておく。
+
+    タイトルが無いときは LookupError、通信エラーはそのまま例外にする
+    （例外は lru_cache に残らないので、失敗した URL は次回また取りに行く）。
+    """
+    pool = _get_http_pool()
+    if pool is not None:
+        resp = pool.request("GET", url, preload_content=False)
+        eof = False
+        try:
+            cm = _CHARSET_RE.search(resp.headers.get("Content-Type", ""))
+            charset = cm.group(1) if cm else "utf-8"
+            m, eof = _scan_title(resp)
+        finally:
+            # 読み切った接続だけプールに戻す（途中でやめたものは残りを読まずに閉じる）
+            if not eof:
+                resp.close()
+            resp.release_conn()
+    else:
+        req = urllib.request.Request(url, headers=_TITLE_HEADERS)
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            charset = resp.headers.get_content_charset() or "utf-8"
+            m, _ = _scan_title(resp)
+
+    if not m:
+        raise LookupError(f"<title> がありません: {url}")
+
+    raw_title = m.group(1)
+    try:
+        title = raw_title.decode(charset, errors="ignore")
+    except Exception:
+        title = raw_title.decode("utf-8", errors="ignore")
+
+    title = html_lib.unescape(_WS_RE.sub(" ", title).strip())
+    if not title:
+        raise LookupError(f"<title> が空です: {url}")
+    return title
+
+
+# リソースキーに使えない文字の並び
+_KEY_INVALID_RE = re.compile(r"[^a-z0-9]+")
+# フローのファイル名に使えない文字（英数字・"-"・"_"・空白以外。\w は str.isalnum() と "_" に一致する）
+_UNSAFE_FILENAME_CHAR_RE = re.compile(r"[^\w\- ]")
+# フロー YAML のトップレベルの name: 行（インデント無し）
+_TOP_NAME_LINE_RE = re.compile(rb"^name:[^\r\n]*", re.MULTILINE)
+# name: 行の直後（空行は飛ばす）がインデントされた行 = 値が次の行に続いている
+_INDENTED_NEXT_LINE_RE = re.compile(rb"\r?\n(?:[ \t]*\r?\n)*[ \t]+\S")
+# name: 行を探すときに読む先頭のバイト数
+_NAME_SCAN_BYTES = 4096
+# ゴミ箱一覧でフロー名を読むとき、1回の after_idle で処理する件数
+_TRASH_NAME_BATCH = 20
+
 DEFAULT_RESOURCES = {
     "sites": {
         "google": {
@@ -56,6 +194,44 @@ DEFAULT_RESOURCES = {
 }
 
 
+# ---- DraggableStepList の表示用テキスト整形 ----
+# 先頭の番号部分（[1] / [↕] / 1. の順に、あれば取り除く）
+_STEP_PREFIX_RE = re.compile(r"^(?:\[\d+\]\s*)?(?:\[↕\]\s*)?(?:\d+\.\s*)?")
+# Windows のパス（C:/Program Files/.../xxx.exe など）
+_WIN_PATH_RE = re.compile(r"[A-Za-z]:[/\\][^\s\[\]]+")
+# [エラー時:stop] や [エラー時:continue]
+_ON_ERROR_SUFFIX_RE = re.compile(r"\s*\[エラー時:[^\]]+\]")
+# 最初の " - "（アクション名と内容の区切り）
+_DASH_SEP_RE = re.compile(r"\s*-\s*")
+# ユーザーフレンドリーな表現への置き換え
+_STEP_TEXT_REPLACEMENTS = (
+    ("マウスを座標へ移動する", "マウスを移動"),
+    ("マウスクリックする", "クリック"),
+    ("指定秒数だけ待つ", "待機"),
+    ("プログラムを起動する", "プログラム起動"),
+)
+# アイコンの判定表: (アイコン, 候補)。候補のどれか1つの語がすべて含まれていれば一致（上から順に見る）
+# 小文字にしたテキストと比べる（日本語は lower() で変わらない）
+_STEP_ICON_RULES = (
+    ("🚀", (("プログラム",), ("起動",))),
+    ("⏸️", (("一時停止",), ("pause",))),
+    ("⏱️", (("待",), ("wait",))),
+    ("👆", (("クリック",), ("click",))),
+    ("🖱️", (("マウス", "移動"),)),
+    ("⌨️", (("入力",), ("type",), ("キーボード",), ("キー",), ("hotkey",))),
+    ("🌐", (("ブラウザ",), ("url",), ("サイト",))),
+    ("📁", (("ファイル",),)),
+    ("💬", (("メッセージ",), ("print",))),
+)
+
+
+def _shorten_win_path(match: "re.Match[str]") -> str:
+    """Windows のパスを、拡張子を除いたファイル名（またはフォルダ名）にする。"""
+    path = match.group(0)
+    filename = path.replace("\\", "/").rsplit("/", 1)[-1]
+    return filename.rsplit(".", 1)[0] if "." in filename else filename
+
+
 class DraggableStepList(tk.Frame):
     """
     ドラッグ&ドロップで並び替え可能なステップリスト。
@@ -66,6 +242,9 @@ class DraggableStepList(tk.Frame):
     ITEM_HEIGHT = 32  # 各アイテムの高さ（ボタン部分）
     ARROW_HEIGHT = 20  # 矢印部分の高さ
     ITEM_PADDING = 2   # アイテム間の余白
+    DRAG_REDRAW_MS = 16    # ドラッグ中の再描画をまとめる間隔（ミリ秒）
+    DOUBLE_CLICK_MS = 500  # この時間内に同じ行をもう一度押したらダブルクリック（Windows の既定値）
+    RESIZE_REDRAW_MS = 50  # リサイズ中の再描画をまとめる間隔（ミリ秒）
     
     def __init__(self, master, dark_mode: bool = False, **kwargs):
         super().__init__(master, **kwargs)
@@ -73,8 +252,19 @@ class DraggableStepList(tk.Frame):
         self._dark_mode = dark_mode
         self._items: List[str] = []  # 表示テキストのリスト
         self._selected_index: Optional[int] = None
-        self._item_widgets: List[dict] = []  # Canvasアイテムの情報
-        self._last_canvas_width = 0  # 前回のCanvas幅
+        # 行ごとの Canvas アイテム（_build_slot で作り置きし、_render_items で使い回す）
+        self._item_widgets: List[dict] = []
+        # <Configure> で受け取った Canvas の (幅, 高さ)。描画のたびに winfo_* で Tcl に問い合わせない
+        self._canvas_size = (1, 1)
+        self._scrollregion: Optional[tuple[int, int, int, int]] = None  # 最後に設定した scrollregion
+        # ダブルクリック判定用: 前回 <Button-1> の (event.time, 行)
+        self._last_click: tuple[int, Optional[int]] = (0, None)
+        # 描画するのは見えている範囲の行だけ。最後に描いたときの (表示位置の上端, 高さ)
+        self._rendered_view: Optional[tuple[float, int]] = None
+        self._scroll_redraw_id: Optional[str] = None
+        # ドラッグ中・リサイズ中の再描画はイベントごとにせず、after でまとめて1回にする
+        self._drag_redraw_id: Optional[str] = None
+        self._resize_redraw_id: Optional[str] = None
         
         # ドラッグ状態
         self._drag_data = {
@@ -95,18 +285,51 @@ class DraggableStepList(tk.Frame):
             highlightbackground=self._border,
         )
         self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        # スクロールしたら見えてきた行を描くため、yscrollcommand は自前で受けてから転送する
+        self._yscroll_target = self.scrollbar.set
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
         
         self.canvas.pack(side="left", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
+        # 行ごとの描画では Canvas のメソッドを通さず canvas コマンドを直接呼ぶ（_update_slot 参照）
+        self._canvas_call = self.canvas.tk.call
+        self._canvas_path = str(self.canvas)
+
+        # 矢印の線は全行で1本を共有する（ボタンの後ろを通るので、見えるのは行の間だけ）
+        # 先に作っておくことで、後から作る行のアイテムより必ず下に来る
+        self._arrow_column = self.canvas.create_line(0, 0, 0, 0, width=2, state="hidden")
+        self._arrow_column_state: Optional[tuple] = None  # 最後に反映した (x, top, bottom, 色)
+
+        # ドラッグ中アイテム（影・本体・アイコン・テキスト）は最初に1組だけ作って隠しておく
+        bold_font = ("Meiryo UI", 9, "bold")
+        self._drag_ghost = {
+            # Tk の色はアルファ値を持てないので、影は網掛けで薄く見せる
+            "shadow": self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#000000", stipple="gray25", outline="", state="hidden", tags="drag_ghost"
+            ),
+            "rect": self.canvas.create_rectangle(
+                0, 0, 0, 0, outline="#ffffff", width=2, state="hidden", tags="drag_ghost"
+            ),
+            "icon": self.canvas.create_text(
+                0, 0, anchor="w", fill="#ffffff", font=bold_font, state="hidden", tags="drag_ghost"
+            ),
+            "text": self.canvas.create_text(
+                0, 0, anchor="w", fill="#ffffff", font=bold_font, state="hidden", tags="drag_ghost"
+            ),
+        }
+        self._drag_ghost_visible = False
         
         # イベントバインド
         self.canvas.bind("<Button-1>", self._on_click)
-        self.canvas.bind("<Double-Button-1>", self._on_double_click)
         self.canvas.bind("<B1-Motion>", self._on_drag)
         self.canvas.bind("<ButtonRelease-1>", self._on_drop)
         self.canvas.bind("<Button-3>", self._on_right_click)
-        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        # ホイールは X11 だと <Button-4>/<Button-5>、Windows / macOS だと <MouseWheel> で届く
+        if self.tk.call("tk", "windowingsystem") == "x11":
+            self.canvas.bind("<Button-4>", self._on_mousewheel)
+            self.canvas.bind("<Button-5>", self._on_mousewheel)
+        else:
+            self.canvas.bind("<MouseWheel>", self._on_mousewheel)
         self.canvas.bind("<Configure>", self._on_canvas_resize)  # ★リサイズ監視
         
         # コールバック
@@ -116,11 +339,43 @@ class DraggableStepList(tk.Frame):
         self._on_reorder_callback = None
     
     def _on_canvas_resize(self, event) -> None:
-        """Canvasがリサイズされたら再描画"""
-        new_width = event.width
-        if new_width != self._last_canvas_width and new_width > 1:
-            self._last_canvas_width = new_width
+        """Canvasがリサイズされたら再描画（ウィンドウのドラッグ中は 50ms ごとにまとめる）
+
+        高さが変わると見える行が増減するので、幅だけでなく高さの変化でも描き直す。
+        """
+        new_size = (event.width, event.height)
+        if new_size != self._canvas_size:
+            self._canvas_size = new_size
+            if event.width > 1 and self._resize_redraw_id is None:
+                self._resize_redraw_id = self.after(self.RESIZE_REDRAW_MS, self._flush_resize_redraw)
+
+    def _flush_resize_redraw(self) -> None:
+        self._resize_redraw_id = None
+        self._render_items()  # 大きさは描画時に _canvas_size を読むので最新になる
+
+    def _on_yscroll(self, first, last) -> None:
+        """Canvas の yscrollcommand。スクロールバーへ転送し、表示範囲が変わっていれば描き直しを予約する"""
+        self._yscroll_target(first, last)
+        if self._scroll_redraw_id is None and self._items:
+            self._scroll_redraw_id = self.after_idle(self._flush_scroll_redraw)
+
+    def _flush_scroll_redraw(self) -> None:
+        self._scroll_redraw_id = None
+        view = (self.canvas.canvasy(0), self._canvas_size[1])
+        if view != self._rendered_view:
+            self._render_items()
+
+    def _flush_drag_redraw(self) -> None:
+        self._drag_redraw_id = None
+        if self._drag_data["active"]:
             self._render_items()
+
+    def destroy(self) -> None:
+        for after_id in (self._drag_redraw_id, self._resize_redraw_id, self._scroll_redraw_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._drag_redraw_id = self._resize_redraw_id = self._scroll_redraw_id = None
+        super().destroy()
     
     def _update_colors(self) -> None:
         """ダークモード対応の色設定"""
@@ -150,16 +405,36 @@ class DraggableStepList(tk.Frame):
         self._dark_mode = dark_mode
         self._update_colors()
         self.canvas.configure(bg=self._bg, highlightbackground=self._border)
+        # 色が変わるので、全行を次の描画で設定し直させる
+        for w in self._item_widgets:
+            w["state"] = None
         self._render_items()
     
-    def insert(self, index: int, text: str) -> None:
-        """アイテムを挿入"""
+    def insert(self, index: int, *texts: str) -> None:
+        """アイテムを挿入（Listbox と同じく複数まとめて渡せる。描画は1回だけ）"""
         if index == tk.END or index >= len(self._items):
-            self._items.append(text)
+            self._items.extend(texts)
         else:
-            self._items.insert(index, text)
+            self._items[index:index] = texts
         self._render_items()
     
+    def set_items(self, texts: List[str]) -> None:
+        """全アイテムを差し替える（選択は解除）。delete + insert と違って描画は1回だけ"""
+        self._items = list(texts)
+        self._selected_index = None
+        self._render_items()
+
+    def update_items(self, changes: Dict[int, str], select: Optional[int] = None) -> None:
+        """指定したインデックスのテキストだけ差し替える（select があれば選択も。描画は1回だけ）"""
+        for index, text in changes.items():
+            if 0 <= index < len(self._items):
+                self._items[index] = text
+        if select is not None and 0 <= select < len(self._items):
+            self._selected_index = select
+        self._render_items()
+        if self._selected_index is not None:
+            self._ensure_visible(self._selected_index)
+
     def delete(self, first, last=None) -> None:
         """アイテムを削除"""
         if first == 0 and last == tk.END:
@@ -190,15 +465,42 @@ class DraggableStepList(tk.Frame):
     
     def selection_clear(self, first, last=None) -> None:
         """選択を解除"""
-        self._selected_index = None
-        self._render_items()
+        self._apply_selection(None)
     
     def selection_set(self, index) -> None:
         """選択を設定"""
         if 0 <= index < len(self._items):
-            self._selected_index = index
-            self._render_items()
+            self._apply_selection(index)
             self._ensure_visible(index)
+
+    def _row_colors(self, selected: bool) -> tuple[str, str, str]:
+        """行の (背景, 枠線, 文字) の色"""
+        if selected:
+            return self._item_selected, "#005a9e", "#ffffff"
+        return self._item_bg, self._item_border, self._fg
+
+    def _apply_selection(self, index: Optional[int]) -> None:
+        """選択行を index に変える。色が変わる（最大）2行だけを塗り直す。
+
+        ドラッグ中や、色を設定し直す必要がある行があるときは全体を描き直す。
+        """
+        old = self._selected_index
+        self._selected_index = index
+        if old == index:
+            return
+        if self._drag_data.get("active"):
+            self._render_items()
+            return
+        # 見えていない行は、スクロールで描かれるときに正しい色になる
+        for w in self._item_widgets:
+            i = w["index"]
+            if i is None or (i != old and i != index):
+                continue
+            state = w["state"]
+            if state is None:
+                self._render_items()
+                return
+            self._update_slot(w, state[:4] + self._row_colors(i == index) + state[7:])
     
     def _ensure_visible(self, index: int) -> None:
         """指定インデックスが見えるようにスクロール"""
@@ -209,7 +511,7 @@ class DraggableStepList(tk.Frame):
         item_top = index * slot_height
         item_bottom = item_top + self.ITEM_HEIGHT
         
-        canvas_height = self.canvas.winfo_height()
+        canvas_height = self._canvas_size[1]
         if canvas_height <= 1:
             return
         
@@ -222,14 +524,91 @@ class DraggableStepList(tk.Frame):
         elif item_bottom > view_bottom:
             self.canvas.yview_moveto((item_bottom - canvas_height) / total_height)
     
+    def _build_slot(self, row: int) -> dict:
+        """1行ぶんの Canvas アイテム（ボタン・アイコン・テキスト・矢印の先端）を作る。
+
+        座標や色は _update_slot で設定する。row 行目のアイテムには slot_{row} タグ、
+        矢印の先端には arrow_{row} タグを付けて、表示/非表示をまとめて切り替えられるようにする。
+        矢印の線は全行共通の _arrow_column を使う。
+        行はドラッグ中（スクロールやリサイズで見える範囲が変わったとき）にも作られるので、
+        作ったらすぐドラッグ中アイテム（drag_ghost）の下に入れておく。
+        """
+        call, path = self._canvas_call, self._canvas_path
+        font = ("Meiryo UI", 9)
+        slot_tag = f"slot_{row}"
+        arrow_tags = (slot_tag, f"arrow_{row}")
+        slot = {
+            "rect": call(path, "create", "rectangle", 0, 0, 0, 0, "-width", 1, "-tags", slot_tag),
+            "icon": call(path, "create", "text", 0, 0, "-anchor", "w", "-font", font, "-tags", slot_tag),
+            "text": call(path, "create", "text", 0, 0, "-anchor", "w", "-font", font, "-tags", slot_tag),
+            "head": call(path, "create", "polygon", 0, 0, 0, 0, 0, 0, "-outline", "", "-tags", arrow_tags),
+            "slot_tag": slot_tag,
+            "arrow_tag": arrow_tags[1],
+            "index": None,
+            "shown": True,
+            # 最後に反映した (y, left, right, arrow_x, bg, border, fg, arrow_color, icon, text, arrow)
+            "state": None,
+        }
+        call(path, "lower", slot_tag, "drag_ghost")
+        return slot
+
+    def _update_slot(self, w: dict, state: tuple) -> None:
+        """行のアイテムを state の内容に合わせる。前回から変わった部分だけ Tcl に送る。
+
+        行数ぶん呼ばれるので、Canvas.coords / itemconfigure（引数の辞書処理や戻り値の
+        変換が入る）は通さず、tk.call で canvas コマンドを直接呼ぶ。座標は int で渡す。
+        """
+        prev = w["state"]
+        if prev == state:
+            return
+        call, path = self._canvas_call, self._canvas_path
+        y, left, right, arrow_x, bg, border, fg, arrow_color, icon, text, arrow = state
+
+        if not w["shown"]:
+            call(path, "itemconfigure", w["slot_tag"], "-state", "normal")
+            w["shown"] = True
+            prev = None  # 矢印の表示状態も含めて設定し直す
+
+        if prev is None or prev[:4] != state[:4]:
+            ih = self.ITEM_HEIGHT
+            ah = self.ARROW_HEIGHT
+            text_y = y + ih // 2 + 1
+            call(path, "coords", w["rect"], left, y + 2, right, y + ih)
+            call(path, "coords", w["icon"], left + 12, text_y)
+            call(path, "coords", w["text"], left + 32, text_y)
+            call(
+                path, "coords", w["head"],
+                arrow_x - 5, y + ih + ah - 8,
+                arrow_x + 5, y + ih + ah - 8,
+                arrow_x, y + ih + ah - 2,
+            )
+        if prev is None or prev[4:8] != state[4:8]:
+            call(path, "itemconfigure", w["rect"], "-fill", bg, "-outline", border)
+            call(path, "itemconfigure", w["icon"], "-fill", fg)
+            call(path, "itemconfigure", w["text"], "-fill", fg)
+            call(path, "itemconfigure", w["head"], "-fill", arrow_color)
+        if prev is None or prev[8] != icon:
+            call(path, "itemconfigure", w["icon"], "-text", icon)
+        if prev is None or prev[9] != text:
+            call(path, "itemconfigure", w["text"], "-text", text)
+        if prev is None or prev[10] != arrow:
+            call(path, "itemconfigure", w["arrow_tag"], "-state", "normal" if arrow else "hidden")
+        w["state"] = state
+
     def _render_items(self) -> None:
-        """全アイテムを描画（フローチャート風ボタン＋矢印）"""
-        self.canvas.delete("all")
-        self._item_widgets.clear()
-        
-        canvas_width = self.canvas.winfo_width()
+        """全アイテムを描画（フローチャート風ボタン＋矢印）
+
+        Canvas アイテムは行ごとに作り置きして使い回し（delete("all") しない）、
+        前回から変わった行だけ coords / itemconfigure で更新する。余った行は隠しておく。
+        描くのは表示範囲（と上下1スロットぶん）に入る行だけで、スクロールすると
+        _on_yscroll から描き直される。前回も見えていたアイテムは同じ行のアイテムを使う。
+        """
+        canvas = self.canvas
+        canvas_width, canvas_height = self._canvas_size
         if canvas_width <= 1:
             canvas_width = 400  # デフォルト幅
+        view_top = canvas.canvasy(0)
+        self._rendered_view = (view_top, canvas_height)
         
         drag_active = self._drag_data.get("active", False)
         drag_idx = self._drag_data.get("index")
@@ -249,15 +628,25 @@ class DraggableStepList(tk.Frame):
         margin_x = 8
         button_left = margin_x
         button_right = canvas_width - margin_x
+        arrow_x = canvas_width // 2
+        
+        # 描画するY座標の範囲（高さがまだ決まっていないときは大きめに取る）
+        cull_top = view_top - slot_height
+        cull_bottom = view_top + (canvas_height if canvas_height > 1 else 600) + slot_height
         
-        # 各アイテムを描画
+        # 各アイテムの位置を決める（ここでは Tcl を呼ばない）
+        wanted: List[tuple[int, int, bool]] = []  # (アイテム番号, y, 矢印を出すか)
         slot = 0  # 描画するスロット位置
         total_slots = len(self._items)
+        if drag_active and drag_idx is not None and 0 <= drag_idx < total_slots:
+            total_slots -= 1  # ドラッグ中のものは数えない
+        # 共通の矢印線を引く範囲（矢印を出す最初の行〜最後の行）
+        line_top: Optional[int] = None
+        line_bottom: Optional[int] = None
         
-        for i, text in enumerate(self._items):
+        for i in range(len(self._items)):
             # ドラッグ中のアイテムはスキップ（後で描画）
             if drag_active and i == drag_idx:
-                total_slots -= 1  # ドラッグ中のものは数えない
                 continue
             
             # ドラッグ中で、現在のスロットがターゲット位置なら、1つずらす（隙間を作る）
@@ -266,209 +655,137 @@ class DraggableStepList(tk.Frame):
             
             y = slot * slot_height
             
-            # 背景色を決定
-            if i == self._selected_index and not drag_active:
-                bg = self._item_selected
-                border_color = "#005a9e"
-                fg = "#ffffff"
-            else:
-                bg = self._item_bg
-                border_color = self._item_border
-                fg = self._fg
-            
-            # テキストを整形
-            clean_text = self._strip_number(text)
-            icon = self._get_step_icon(clean_text)
-            formatted_text = self._format_step_text(clean_text)
-            
-            # ボタン風の矩形を描画（角丸風に見せるため枠線付き）
-            rect = self.canvas.create_rectangle(
-                button_left, y + 2,
-                button_right, y + self.ITEM_HEIGHT,
-                fill=bg,
-                outline=border_color,
-                width=1,
-                tags=f"item_{i}",
-            )
-            
-            # アイコンを描画（固定位置）
-            self.canvas.create_text(
-                button_left + 12, y + self.ITEM_HEIGHT // 2 + 1,
-                text=icon,
-                anchor="w",
-                fill=fg,
-                font=("Meiryo UI", 9),
-                tags=f"item_{i}",
-            )
-            
-            # テキストを描画（アイコンの後の固定位置から）
-            txt = self.canvas.create_text(
-                button_left + 32, y + self.ITEM_HEIGHT // 2 + 1,
-                text=formatted_text,
-                anchor="w",
-                fill=fg,
-                font=("Meiryo UI", 9),
-                tags=f"item_{i}",
-            )
-            
             # 矢印を描画（最後のアイテム以外）
             actual_remaining = total_slots - slot - 1
-            if actual_remaining > 0 or (drag_active and slot < len(self._items) - 1):
-                arrow_y = y + self.ITEM_HEIGHT + self.ARROW_HEIGHT // 2 + 2
-                arrow_x = canvas_width // 2
-                
-                # 矢印の線
-                self.canvas.create_line(
-                    arrow_x, y + self.ITEM_HEIGHT + 2,
-                    arrow_x, y + self.ITEM_HEIGHT + self.ARROW_HEIGHT - 2,
-                    fill=self._arrow_color,
-                    width=2,
-                    tags=f"arrow_{i}",
-                )
-                
-                # 矢印の先端（三角形）
-                self.canvas.create_polygon(
-                    arrow_x - 5, y + self.ITEM_HEIGHT + self.ARROW_HEIGHT - 8,
-                    arrow_x + 5, y + self.ITEM_HEIGHT + self.ARROW_HEIGHT - 8,
-                    arrow_x, y + self.ITEM_HEIGHT + self.ARROW_HEIGHT - 2,
-                    fill=self._arrow_color,
-                    outline="",
-                    tags=f"arrow_{i}",
-                )
+            show_arrow = actual_remaining > 0 or (drag_active and slot < len(self._items) - 1)
+            if show_arrow:
+                if line_top is None:
+                    line_top = y + self.ITEM_HEIGHT + 2
+                line_bottom = y + self.ITEM_HEIGHT + self.ARROW_HEIGHT - 2
             
-            self._item_widgets.append({"rect": rect, "text": txt, "index": i})
+            if cull_top <= y <= cull_bottom:
+                wanted.append((i, y, show_arrow))
             slot += 1
         
-        # ドラッグ中のアイテムを最前面に描画
+        # 前回も見えていたアイテムは同じ行を使い、それ以外は空いた行を使い回す
+        pool = self._item_widgets
+        wanted_indexes = {i for i, _, _ in wanted}
+        by_index = {w["index"]: w for w in pool if w["index"] in wanted_indexes}
+        spare = [w for w in pool if w["index"] not in by_index]
+        
+        for i, y, show_arrow in wanted:
+            w = by_index.get(i)
+            if w is None:
+                if spare:
+                    w = spare.pop()
+                else:
+                    w = self._build_slot(len(pool))
+                    pool.append(w)
+                w["index"] = i
+            
+            # 背景色を決定
+            bg, border_color, fg = self._row_colors(i == self._selected_index and not drag_active)
+            
+            # テキストを整形
+            icon, formatted_text = _step_display_parts(self._items[i])
+            
+            self._update_slot(w, (
+                y, button_left, button_right, arrow_x,
+                bg, border_color, fg, self._arrow_color,
+                icon, formatted_text, show_arrow,
+            ))
+        
+        # 使わなかった行は消さずに隠す
+        for w in spare:
+            w["index"] = None
+            if w["shown"]:
+                canvas.itemconfigure(w["slot_tag"], state="hidden")
+                w["shown"] = False
+        
+        # 矢印の線（1本）を引き直す
+        column = None if line_top is None else (arrow_x, line_top, line_bottom, self._arrow_color)
+        if column != self._arrow_column_state:
+            if column is None:
+                canvas.itemconfigure(self._arrow_column, state="hidden")
+            else:
+                canvas.coords(self._arrow_column, arrow_x, line_top, arrow_x, line_bottom)
+                canvas.itemconfigure(self._arrow_column, fill=self._arrow_color, state="normal")
+            self._arrow_column_state = column
+        
+        # ドラッグ中のアイテムを最前面に描画（drag_ghost は常に行のアイテムより上にある）
+        ghost = self._drag_ghost
         if drag_active and drag_idx is not None and 0 <= drag_idx < len(self._items):
-            text = self._items[drag_idx]
-            clean_text = self._strip_number(text)
-            icon = self._get_step_icon(clean_text)
-            formatted_text = self._format_step_text(clean_text)
+            icon, formatted_text = _step_display_parts(self._items[drag_idx])
             
-            # ドラッグ中アイテムの背景（影付き風）
+            # 影付き風にずらす量
             shadow_offset = 4
-            self.canvas.create_rectangle(
+            text_y = drag_y + self.ITEM_HEIGHT // 2 + 1
+            call, path = self._canvas_call, self._canvas_path
+            call(
+                path, "coords", ghost["shadow"],
                 button_left + shadow_offset, drag_y + 2 + shadow_offset,
                 button_right + shadow_offset, drag_y + self.ITEM_HEIGHT + shadow_offset,
-                fill="#00000022",
-                outline="",
-                tags="dragging_shadow",
-            )
-            
-            # ドラッグ中アイテム本体
-            self.canvas.create_rectangle(
-                button_left, drag_y + 2,
-                button_right, drag_y + self.ITEM_HEIGHT,
-                fill=self._item_selected,
-                outline="#ffffff",
-                width=2,
-                tags="dragging",
-            )
-            
-            # ドラッグ中アイコン
-            self.canvas.create_text(
-                button_left + 12, drag_y + self.ITEM_HEIGHT // 2 + 1,
-                text=icon,
-                anchor="w",
-                fill="#ffffff",
-                font=("Meiryo UI", 9, "bold"),
-                tags="dragging",
-            )
-            
-            # ドラッグ中テキスト
-            self.canvas.create_text(
-                button_left + 32, drag_y + self.ITEM_HEIGHT // 2 + 1,
-                text=formatted_text,
-                anchor="w",
-                fill="#ffffff",
-                font=("Meiryo UI", 9, "bold"),
-                tags="dragging",
             )
+            call(path, "coords", ghost["rect"], button_left, drag_y + 2, button_right, drag_y + self.ITEM_HEIGHT)
+            call(path, "coords", ghost["icon"], button_left + 12, text_y)
+            call(path, "coords", ghost["text"], button_left + 32, text_y)
+            if not self._drag_ghost_visible:
+                canvas.itemconfigure(ghost["rect"], fill=self._item_selected)
+                canvas.itemconfigure(ghost["icon"], text=icon)
+                canvas.itemconfigure(ghost["text"], text=formatted_text)
+                # 行のアイテムは _build_slot で drag_ghost の下に入れてあるので、raise は要らない
+                canvas.itemconfigure("drag_ghost", state="normal")
+                self._drag_ghost_visible = True
+        elif self._drag_ghost_visible:
+            canvas.itemconfigure("drag_ghost", state="hidden")
+            self._drag_ghost_visible = False
         
         # スクロール領域を更新（コンテンツがCanvas高さより小さい場合はスクロール無効）
+        # 行数・Canvas の大きさが変わらない限り設定し直さない（選択やドラッグでは変わらない）
         total_height = len(self._items) * slot_height + 10
-        canvas_height = self.canvas.winfo_height()
-        if canvas_height > 1 and total_height <= canvas_height:
-            # コンテンツが表示領域に収まる場合はスクロール不要
-            self.canvas.configure(scrollregion=(0, 0, canvas_width, canvas_height))
-            self.canvas.yview_moveto(0)  # 先頭に戻す
-        else:
-            self.canvas.configure(scrollregion=(0, 0, canvas_width, total_height))
+        fits = canvas_height > 1 and total_height <= canvas_height
+        region = (0, 0, canvas_width, canvas_height if fits else total_height)
+        if region != self._scrollregion:
+            self._scrollregion = region
+            canvas.configure(scrollregion=region)
+            if fits:
+                # コンテンツが表示領域に収まる場合はスクロール不要
+                canvas.yview_moveto(0)  # 先頭に戻す
     
-    def _strip_number(self, text: str) -> str:
+    @staticmethod
+    def _strip_number(text: str) -> str:
         """テキストから先頭の番号部分を削除する"""
-        import re
-        # [1] や [12] などのパターンを削除
-        text = re.sub(r'^\[\d+\]\s*', '', text)
-        # [↕] パターンも削除
-        text = re.sub(r'^\[↕\]\s*', '', text)
-        # 1. や 12. などのパターンも削除
-        text = re.sub(r'^\d+\.\s*', '', text)
-        return text.strip()
+        # [1] / [↕] / 1. などのパターンを削除
+        return _STEP_PREFIX_RE.sub("", text, count=1).strip()
     
-    def _get_step_icon(self, text: str) -> str:
+    @staticmethod
+    def _get_step_icon(text: str) -> str:
         """ステップの種類に応じたアイコンを返す"""
         text_lower = text.lower()
-        if "プログラム" in text or "起動" in text:
-            return "🚀"
-        elif "一時停止" in text or "pause" in text_lower:
-            return "⏸️"
-        elif "待" in text or "wait" in text_lower:
-            return "⏱️"
-        elif "クリック" in text or "click" in text_lower:
-            return "👆"
-        elif "マウス" in text and "移動" in text:
-            return "🖱️"
-        elif "入力" in text or "type" in text_lower or "キーボード" in text:
-            return "⌨️"
-        elif "キー" in text or "hotkey" in text_lower:
-            return "⌨️"
-        elif "ブラウザ" in text or "url" in text_lower:
-            return "🌐"
-        elif "サイト" in text:
-            return "🌐"
-        elif "ファイル" in text:
-            return "📁"
-        elif "メッセージ" in text or "print" in text_lower:
-            return "💬"
-        else:
-            return "▶️"
+        for icon, candidates in _STEP_ICON_RULES:
+            for words in candidates:
+                if all(w in text_lower for w in words):
+                    return icon
+        return "▶️"
     
-    def _format_step_text(self, text: str) -> str:
+    @staticmethod
+    def _format_step_text(text: str) -> str:
         """ステップのテキストをユーザーフレンドリーに整形"""
-        # パスを短くする
-        import re
-        
-        # C:/Program Files/.../xxx.exe → xxx.exe または フォルダ名
-        def shorten_path(match):
-            path = match.group(0)
-            # ファイル名だけ取り出す
-            parts = path.replace("\\", "/").split("/")
-            filename = parts[-1] if parts else path
-            # 拡張子を除いた名前
-            name = filename.rsplit(".", 1)[0] if "." in filename else filename
-            return name
-        
-        # Windowsパスのパターン
-        text = re.sub(r'[A-Za-z]:[/\\][^\s\[\]]+', shorten_path, text)
+        # C:/Program Files/.../xxx.exe → xxx または フォルダ名
+        text = _WIN_PATH_RE.sub(_shorten_win_path, text)
         
         # [エラー時:stop] や [エラー時:continue] を削除（一旦非表示）
-        text = re.sub(r'\s*\[エラー時:[^\]]+\]', '', text)
+        text = _ON_ERROR_SUFFIX_RE.sub("", text)
         
         # ユーザーフレンドリーな表現に変換
-        text = text.replace("マウスを座標へ移動する", "マウスを移動")
-        text = text.replace("マウスクリックする", "クリック")
-        text = text.replace("指定秒数だけ待つ", "待機")
-        text = text.replace("プログラムを起動する", "プログラム起動")
+        for old, new in _STEP_TEXT_REPLACEMENTS:
+            text = text.replace(old, new)
         
         # 余分なスペースを整理
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WS_RE.sub(" ", text).strip()
         
         # " - " の前後を整理
-        text = re.sub(r'\s*-\s*', ': ', text, count=1)
-        
-        return text
+        return _DASH_SEP_RE.sub(": ", text, count=1)
     
     def _get_index_at_y(self, y: int) -> int:
         """Y座標からインデックスを取得"""
@@ -483,7 +800,16 @@ class DraggableStepList(tk.Frame):
             return
         
         index = self._get_index_at_y(event.y)
-        self._selected_index = index
+        
+        # <Double-Button-1> はバインドせず、ここで判定する（2回目の <Button-1> で
+        # 選択・ドラッグ準備をやり直してからダブルクリック処理、という二度手間をなくす）
+        last_time, last_index = self._last_click
+        if last_index == index and 0 <= event.time - last_time < self.DOUBLE_CLICK_MS:
+            self._last_click = (0, None)  # 3回目のクリックは新しいクリックとして扱う
+            self._drag_data = {"active": False, "index": None, "start_y": 0, "current_y": 0}
+            self._on_double_click(event)
+            return
+        self._last_click = (event.time, index)
         
         # ドラッグ開始準備
         slot_height = self.ITEM_HEIGHT + self.ARROW_HEIGHT + self.ITEM_PADDING
@@ -495,7 +821,7 @@ class DraggableStepList(tk.Frame):
             "current_y": index * slot_height,
         }
         
-        self._render_items()
+        self._apply_selection(index)
         
         if self._on_select_callback:
             self._on_select_callback(index)
@@ -511,8 +837,7 @@ class DraggableStepList(tk.Frame):
             return
         
         index = self._get_index_at_y(event.y)
-        self._selected_index = index
-        self._render_items()
+        self._apply_selection(index)
         
         if self._on_right_click_callback:
             self._on_right_click_callback(event, index)
@@ -534,9 +859,11 @@ class DraggableStepList(tk.Frame):
         canvas_y = self.canvas.canvasy(event.y)
         offset = canvas_y - self._drag_data["start_canvas_y"]
         original_y = self._drag_data["index"] * slot_height
-        self._drag_data["current_y"] = original_y + offset
+        self._drag_data["current_y"] = int(original_y + offset)  # Tcl には整数で渡す
         
-        self._render_items()
+        # マウスの移動イベントごとには描かず、DRAG_REDRAW_MS に1回だけ最新の位置で描く
+        if self._drag_redraw_id is None:
+            self._drag_redraw_id = self.after(self.DRAG_REDRAW_MS, self._flush_drag_redraw)
     
     def _on_drop(self, event) -> None:
         """ドロップ処理"""
@@ -550,9 +877,12 @@ class DraggableStepList(tk.Frame):
         self._drag_data = {"active": False, "index": None, "start_y": 0, "current_y": 0}
         
         if from_index != to_index and from_index is not None:
-            # アイテムを移動
-            item = self._items.pop(from_index)
-            self._items.insert(to_index, item)
+            # アイテムを移動（from〜to の範囲だけを1つ回転させる。範囲外の行は描画でも変化なし）
+            items = self._items
+            if from_index < to_index:
+                items[from_index:to_index + 1] = items[from_index + 1:to_index + 1] + [items[from_index]]
+            else:
+                items[to_index:from_index + 1] = [items[from_index]] + items[to_index:from_index]
             self._selected_index = to_index
             
             if self._on_reorder_callback:
@@ -561,8 +891,14 @@ class DraggableStepList(tk.Frame):
         self._render_items()
     
     def _on_mousewheel(self, event) -> None:
-        """マウスホイールでスクロール"""
-        self.canvas.yview_scroll(-1 * (event.delta // 120), "units")
+        """マウスホイールでスクロール（1イベント1単位。向きは Button-4/5 か delta の符号で決める）
+
+        delta は Windows だと1ノッチ 120、macOS だと ±1 前後なので、割り算せずに符号だけを見る。
+        """
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        elif event.num == 5 or event.delta < 0:
+            self.canvas.yview_scroll(1, "units")
     
     # コールバック設定
     def set_on_select(self, callback) -> None:
@@ -588,13 +924,303 @@ class DraggableStepList(tk.Frame):
     def config(self, **kwargs):
         """Listbox互換: config"""
         if "yscrollcommand" in kwargs:
-            self.canvas.configure(yscrollcommand=kwargs["yscrollcommand"])
+            # Canvas には _on_yscroll を付けたまま、転送先だけ差し替える
+            self._yscroll_target = kwargs["yscrollcommand"]
     
     def yview(self, *args):
         """Listbox互換: yview"""
         return self.canvas.yview(*args)
 
 
+@lru_cache(maxsize=2048)
+def _step_display_parts(text: str) -> tuple[str, str]:
+    """ステップ一覧の表示テキストから (アイコン, 整形済みテキスト) を作る。
+
+    結果はテキストだけで決まる（色やインスタンスに依らない）ので、同じテキストは2回目から整形しない。
+    """
+    clean_text = DraggableStepList._strip_number(text)
+    return DraggableStepList._get_step_icon(clean_text), DraggableStepList._format_step_text(clean_text)
+
+
+class Field(NamedTuple):
+    """StepEditor の入力欄1つ分の定義。省略時の値はここで決めておく。"""
+
+    name: str
+    label: str
+    type: str = "str"
+    default: Any = ""
+    optional: bool = False
+
+
+# StepEditor で選べるアクションの定義（画面表示用。ダイアログを開くたびに作り直さない）
+ACTION_DEFS: tuple[Dict[str, Any], ...] = (
+    {
+        "id": "print",
+        "label": "メッセージを表示する",
+        "help": "ログにメッセージを出します（画面の右側に出るログ）。",
+        "fields": (
+            Field(name="prefix", label="先頭につける文字（任意）", type="str", default="[AVANTIXRPA]"),
+            Field(name="message", label="メッセージ本体", type="str", default="ここに表示したい文章"),
+        ),
+    },
+    {
+        "id": "wait",
+        "label": "指定秒数だけ待つ",
+        "help": "次のステップに進む前に、指定した秒数だけ待機します。",
+        "fields": (
+            Field(name="seconds", label="待機秒数（秒）", type="float", default=1.0),
+        ),
+    },
+    {
+        "id": "browser.open",
+        "label": "ブラウザでURLを開く",
+        "help": "既定のブラウザでURLを開きます。",
+        "fields": (
+            Field(name="url", label="URL", type="str", default="https://www.google.com"),
+        ),
+    },
+    {
+        "id": "resource.open_site",
+        "label": "登録済みサイトを開く",
+        "help": "リソース管理タブで登録した「サイト」を開きます。",
+        "fields": (
+            Field(name="key", label="サイト（表示名）", type="str", default="google"),
+        ),
+    },
+    {
+        "id": "resource.open_file",
+        "label": "登録済みファイルを開く",
+        "help": "リソース管理タブで登録した「ファイル」を開きます。",
+        "fields": (
+            Field(name="key", label="ファイル（表示名）", type="str", default="sample_excel"),
+        ),
+    },
+    {
+        "id": "run.program",
+        "label": "プログラムを起動する",
+        "help": "指定したプログラム（EXEなど）を起動します。",
+        "fields": (
+            Field(name="program", label="プログラム名 or パス", type="str", default="notepad.exe"),
+            Field(name="args", label="引数（必要な場合のみ）", type="str", default="", optional=True),
+        ),
+    },
+    {
+        "id": "ui.type",
+        "label": "文字を入力する（キーボード）",
+        "help": "アクティブなウィンドウに文字列をタイプします。",
+        "fields": (
+            Field(name="text", label="入力する文字列", type="str", default="これはAVANTIXRPAのテストです。"),
+        ),
+    },
+    {
+        "id": "ui.hotkey",
+        "label": "キー操作を送る（Enter / Ctrl+Sなど）",
+        "help": "Enter や Ctrl+S などのキー操作を送ります。",
+        "fields": (
+            Field(
+                name="keys",
+                label="キー（カンマ区切り） 例: ctrl,s / enter",
+                type="list_str",
+                default="enter",
+            ),
+        ),
+    },
+    {
+        "id": "ui.move",
+        "label": "マウスを座標へ移動する",
+        "help": "画面上の座標（x, y）へマウスカーソルを移動します。",
+        "fields": (
+            Field(name="delay", label="実行前の待機（秒）", type="float", default=None, optional=True),
+            Field(name="x", label="X座標", type="int", default=500),
+            Field(name="y", label="Y座標", type="int", default=300),
+            Field(name="duration", label="移動時間（秒）", type="float", default=0.3),
+        ),
+    },
+    {
+        "id": "ui.click",
+        "label": "マウスクリックする",
+        "help": "マウスクリックをします。座標を空欄にすると現在位置でクリックします。",
+        "fields": (
+            Field(name="delay", label="実行前の待機（秒）", type="float", default=None, optional=True),
+            Field(name="button", label="ボタン（left/right/middle）", type="str", default="left"),
+            Field(name="clicks", label="クリック回数", type="int", default=1),
+            Field(name="x", label="X座標（任意）", type="int", default=None, optional=True),
+            Field(name="y", label="Y座標（任意）", type="int", default=None, optional=True),
+        ),
+    },
+    {
+        "id": "ui.scroll",
+        "label": "画面をスクロールする",
+        "help": "マウスホイールで画面をスクロールします。プラスで上、マイナスで下にスクロールします。",
+        "fields": (
+            Field(name="delay", label="実行前の待機（秒）", type="float", default=None, optional=True),
+            Field(name="amount", label="スクロール量（+で上 / -で下）", type="int", default=-500),
+            Field(name="x", label="X座標（任意）", type="int", default=None, optional=True),
+            Field(name="y", label="Y座標（任意）", type="int", default=None, optional=True),
+        ),
+    },
+    {
+        "id": "file.copy",
+        "label": "ファイルをコピーする",
+        "help": "ファイルを別の場所にコピーします。",
+        "fields": (
+            Field(name="src", label="コピー元ファイルパス", type="str", default="src.txt"),
+            Field(name="dst", label="コピー先ファイルパス", type="str", default="dst.txt"),
+            Field(name="preserve_metadata", label="更新日時などもコピー（true/false、任意）", type="bool", default=None, optional=True),
+        ),
+    },
+    {
+        "id": "file.move",
+        "label": "ファイルを移動する",
+        "help": "ファイルを別の場所に移動します。",
+        "fields": (
+            Field(name="src", label="移動元ファイルパス", type="str", default="old.txt"),
+            Field(name="dst", label="移動先ファイルパス", type="str", default="new.txt"),
+        ),
+    },
+    {
+        "id": "pause",
+        "label": "一時停止（手動で再開）",
+        "help": "ダイアログが表示され、「OK」を押すまでフローが一時停止します。手動作業を挟みたい時に使います。",
+        "fields": (
+            Field(name="message", label="表示するメッセージ", type="str", default="準備ができたら「OK」を押してください"),
+        ),
+    },
+)
+
+# StepEditor でリソース選択コンボを出すフィールド: (action_id, field_name) -> resources の種別
+_RESOURCE_KEY_FIELDS: Dict[tuple[str, str], str] = {
+    ("resource.open_site", "key"): "sites",
+    ("resource.open_file", "key"): "files",
+}
+
+LABEL_TO_DEF: Dict[str, Dict[str, Any]] = {d["label"]: d for d in ACTION_DEFS}
+ID_TO_DEF: Dict[str, Dict[str, Any]] = {d["id"]: d for d in ACTION_DEFS}
+ACTION_LABELS: tuple[str, ...] = tuple(d["label"] for d in ACTION_DEFS)
+# StepEditor に渡す登録済みアクション ID（import 時に1回だけ作る）
+_BUILTIN_ACTION_IDS: tuple[str, ...] = tuple(BUILTIN_ACTIONS)
+
+
+def _flow_file_stem(name: str) -> str:
+    """フロー名からファイル名（拡張子なし）を作る。使えない文字は "_"、空白も "_" にする。"""
+    return _UNSAFE_FILENAME_CHAR_RE.sub("_", name).strip().replace(" ", "_") or "flow"
+
+
+def _write_flow_with_name(src: Path, dst: Path, new_name: str) -> None:
+    """src のフロー YAML を name だけ差し替えて dst に書く。
+
+    トップレベルの name: 行が1行で完結していれば（その行だけを YAML として読めて、
+    次の行が続きのインデントでなければ）、その行だけを置き換えてコメントや書式はそのまま残す。
+    それ以外（name が無い・複数行の値など）のときだけ、読み込んで name を変えてから書き直す。
+    """
+    raw = src.read_bytes()
+    m = _TOP_NAME_LINE_RE.search(raw)
+    if m and not _INDENTED_NEXT_LINE_RE.match(raw, m.end()):
+        try:
+            data = yaml.load(m.group(0), Loader=_YamlLoader)
+        except yaml.YAMLError:
+            data = None
+        if isinstance(data, dict) and "name" in data:
+            name_line = yaml.dump(
+                {"name": new_name}, Dumper=_YamlDumper, allow_unicode=True, width=1 << 30
+            ).rstrip("\n").encode("utf-8")
+            dst.write_bytes(raw[: m.start()] + name_line + raw[m.end():])
+            return
+
+    data = yaml.load(raw, Loader=_YamlLoader) or {}
+    if not isinstance(data, dict):
+        data = {}
+
+    data["name"] = new_name
+
+    dst.write_text(
+        yaml.dump(data, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False),
+        encoding="utf-8",
+    )
+
+
+def _read_flow_name(p: Path) -> Optional[str]:
+    """フロー YAML の name だけを読む。
+
+    先頭 4KB からトップレベルの name: 行を探してその1行だけを YAML として読み、
+    見つからない・1行で完結しないときだけファイル全体を読む。
+    """
+    with p.open("rb") as f:
+        head = f.read(_NAME_SCAN_BYTES)
+    m = _TOP_NAME_LINE_RE.search(head)
+    if m:
+        try:
+            data = yaml.load(m.group(0), Loader=_YamlLoader)
+        except yaml.YAMLError:
+            data = None
+        if isinstance(data, dict) and isinstance(data.get("name"), str) and data["name"]:
+            return data["name"]
+
+    with p.open("r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YamlLoader) or {}
+    if isinstance(data, dict) and data.get("name"):
+        return str(data["name"])
+    return None
+
+
+def _set_entry_text(entry: ttk.Entry, text: str) -> None:
+    """textvariable を持たない Entry の中身を置き換える。"""
+    entry.delete(0, tk.END)
+    entry.insert(0, text)
+
+
+class _PointerCaptureWindow(tk.Toplevel):
+    """
+    マウス座標を定期的に読み取って pos_label に表示するウィンドウの共通部分。
+    座標が変わったときだけラベルを書き換え、フォーカスが無いときは間隔を延ばす。
+    """
+
+    POLL_MS_FOCUSED = 33
+    POLL_MS_UNFOCUSED = 250
+
+    pos_label: ttk.Label
+
+    def _start_position_polling(self) -> None:
+        self._last_xy: tuple[int, int] = (-1, -1)
+        self._last_poll = 0.0  # time.monotonic() での最終取得時刻
+        self._after_id: Optional[str] = None
+        self._poll_ms = self.POLL_MS_FOCUSED
+        self.bind("<FocusIn>", lambda e: self._set_poll_interval(self.POLL_MS_FOCUSED), add="+")
+        self.bind("<FocusOut>", lambda e: self._set_poll_interval(self.POLL_MS_UNFOCUSED), add="+")
+        self._update_position()
+
+    def _set_poll_interval(self, ms: int) -> None:
+        self._poll_ms = ms
+
+    def _update_position(self) -> None:
+        try:
+            xy = self.winfo_pointerxy()
+            self._last_poll = time.monotonic()
+            if xy != self._last_xy:
+                self._last_xy = xy
+                self.pos_label.config(text=f"現在の座標: x={xy[0]}, y={xy[1]}")
+        except Exception:
+            pass
+        self._after_id = self.after(self._poll_ms, self._update_position)
+
+    def _current_xy(self) -> tuple[int, int]:
+        """確定用の座標。直近のポーリング結果が新しければそれを使い、古ければ取り直す。"""
+        if self._last_xy != (-1, -1) and time.monotonic() - self._last_poll <= self._poll_ms / 1000:
+            return self._last_xy
+        return self.winfo_pointerxy()
+
+    def destroy(self) -> None:
+        # 閉じた後に after のコールバックが残らないように止める
+        after_id = getattr(self, "_after_id", None)
+        if after_id is not None:
+            try:
+                self.after_cancel(after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        super().destroy()
+
+
 class StepEditor(tk.Toplevel):
     """
     1ステップ分（action + params）の編集ダイアログ。
@@ -604,7 +1230,7 @@ class StepEditor(tk.Toplevel):
     def __init__(
         self,
         master: tk.Tk,
-        action_ids: List[str],
+        action_ids: tuple[str, ...],
         initial_step: Optional[Dict[str, Any]] = None,
         resources: Optional[Dict[str, Any]] = None,
         dark_mode: bool = False,
@@ -612,191 +1238,88 @@ class StepEditor(tk.Toplevel):
         super().__init__(master)
         self.title("ステップ編集")
         self.resizable(False, False)
-        self.grab_set()  # モーダルっぽく
+        # 閉じても破棄せずに隠して使い回す（show_modal / reset 参照）
+        self.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
         self._dark_mode = dark_mode
         self._result: Optional[Dict[str, Any]] = None
+        self._closed_var = tk.BooleanVar(self, value=False)
 
         # 座標フィールド用
         self._current_action_id: str = ""
-        self._x_var: Optional[tk.StringVar] = None
-        self._y_var: Optional[tk.StringVar] = None
-
-        # リソース情報（サイト / ファイル）
-        if resources is None:
-            resources = {}
-        self.resources: Dict[str, Any] = {
-            "sites": resources.get("sites") or {},
-            "files": resources.get("files") or {},
-        }
+        self._x_entry: Optional[ttk.Entry] = None
+        self._y_entry: Optional[ttk.Entry] = None
+        # D&D の <<Drop>> 用に登録した Tcl コマンド（_get_dnd_drop_cmd）
+        self._dnd_drop_cmd: Optional[str] = None
+        # パラメータ欄の Label/Entry プール: (name, type) -> (Label, Entry)
+        self._widget_pool: Dict[tuple[str, str], tuple[ttk.Label, ttk.Entry]] = {}
+        # リソース選択コンボ: 種別（sites / files）-> ウィジェット一式と最後に設定した values
+        self._resource_pool: Dict[str, Dict[str, Any]] = {}
 
         # ★ ダークモード時の色設定
         self._apply_dialog_theme()
 
-        # アクション定義
-        self.action_defs: List[Dict[str, Any]] = [
-            {
-                "id": "print",
-                "label": "メッセージを表示する",
-                "help": "ログにメッセージを出します（画面の右側に出るログ）。",
-                "fields": [
-                    {"name": "prefix", "label": "先頭につける文字（任意）", "type": "str", "default": "[AVANTIXRPA]"},
-                    {"name": "message", "label": "メッセージ本体", "type": "str", "default": "ここに表示したい文章"},
-                ],
-            },
-            {
-                "id": "wait",
-                "label": "指定秒数だけ待つ",
-                "help": "次のステップに進む前に、指定した秒数だけ待機します。",
-                "fields": [
-                    {"name": "seconds", "label": "待機秒数（秒）", "type": "float", "default": 1.0},
-                ],
-            },
-            {
-                "id": "browser.open",
-                "label": "ブラウザでURLを開く",
-                "help": "既定のブラウザでURLを開きます。",
-                "fields": [
-                    {"name": "url", "label": "URL", "type": "str", "default": "https://www.google.com"},
-                ],
-            },
-            {
-                "id": "resource.open_site",
-                "label": "登録済みサイトを開く",
-                "help": "リソース管理タブで登録した「サイト」を開きます。",
-                "fields": [
-                    {"name": "key", "label": "サイト（表示名）", "type": "str", "default": "google"},
-                ],
-            },
-            {
-                "id": "resource.open_file",
-                "label": "登録済みファイルを開く",
-                "help": "リソース管理タブで登録した「ファイル」を開きます。",
-                "fields": [
-                    {"name": "key", "label": "ファイル（表示名）", "type": "str", "default": "sample_excel"},
-                ],
-            },
-            {
-                "id": "run.program",
-                "label": "プログラムを起動する",
-                "help": "指定したプログラム（EXEなど）を起動します。",
-                "fields": [
-                    {"name": "program", "label": "プログラム名 or パス", "type": "str", "default": "notepad.exe"},
-                    {"name": "args", "label": "引数（必要な場合のみ）", "type": "str", "default": "", "optional": True},
-                ],
-            },
-            {
-                "id": "ui.type",
-                "label": "文字を入力する（キーボード）",
-                "help": "アクティブなウィンドウに文字列をタイプします。",
-                "fields": [
-                    {"name": "text", "label": "入力する文字列", "type": "str", "default": "これはAVANTIXRPAのテストです。"},
-                ],
-            },
-            {
-                "id": "ui.hotkey",
-                "label": "キー操作を送る（Enter / Ctrl+Sなど）",
-                "help": "Enter や Ctrl+S などのキー操作を送ります。",
-                "fields": [
-                    {
-                        "name": "keys",
-                        "label": "キー（カンマ区切り） 例: ctrl,s / enter",
-                        "type": "list_str",
-                        "default": "enter",
-                    },
-                ],
-            },
-            {
-                "id": "ui.move",
-                "label": "マウスを座標へ移動する",
-                "help": "画面上の座標（x, y）へマウスカーソルを移動します。",
-                "fields": [
-                    {"name": "delay", "label": "実行前の待機（秒）", "type": "float", "default": None, "optional": True},
-                    {"name": "x", "label": "X座標", "type": "int", "default": 500},
-                    {"name": "y", "label": "Y座標", "type": "int", "default": 300},
-                    {"name": "duration", "label": "移動時間（秒）", "type": "float", "default": 0.3},
-                ],
-            },
-            {
-                "id": "ui.click",
-                "label": "マウスクリックする",
-                "help": "マウスクリックをします。座標を空欄にすると現在位置でクリックします。",
-                "fields": [
-                    {"name": "delay", "label": "実行前の待機（秒）", "type": "float", "default": None, "optional": True},
-                    {"name": "button", "label": "ボタン（left/right/middle）", "type": "str", "default": "left"},
-                    {"name": "clicks", "label": "クリック回数", "type": "int", "default": 1},
-                    {"name": "x", "label": "X座標（任意）", "type": "int", "default": None, "optional": True},
-                    {"name": "y", "label": "Y座標（任意）", "type": "int", "default": None, "optional": True},
-                ],
-            },
-            {
-                "id": "ui.scroll",
-                "label": "画面をスクロールする",
-                "help": "マウスホイールで画面をスクロールします。プラスで上、マイナスで下にスクロールします。",
-                "fields": [
-                    {"name": "delay", "label": "実行前の待機（秒）", "type": "float", "default": None, "optional": True},
-                    {"name": "amount", "label": "スクロール量（+で上 / -で下）", "type": "int", "default": -500},
-                    {"name": "x", "label": "X座標（任意）", "type": "int", "default": None, "optional": True},
-                    {"name": "y", "label": "Y座標（任意）", "type": "int", "default": None, "optional": True},
-                ],
-            },
-            {
-                "id": "file.copy",
-                "label": "ファイルをコピーする",
-                "help": "ファイルを別の場所にコピーします。",
-                "fields": [
-                    {"name": "src", "label": "コピー元ファイルパス", "type": "str", "default": "src.txt"},
-                    {"name": "dst", "label": "コピー先ファイルパス", "type": "str", "default": "dst.txt"},
-                ],
-            },
-            {
-                "id": "file.move",
-                "label": "ファイルを移動する",
-                "help": "ファイルを別の場所に移動します。",
-                "fields": [
-                    {"name": "src", "label": "移動元ファイルパス", "type": "str", "default": "old.txt"},
-                    {"name": "dst", "label": "移動先ファイルパス", "type": "str", "default": "new.txt"},
-                ],
-            },
-            {
-                "id": "pause",
-                "label": "一時停止（手動で再開）",
-                "help": "ダイアログが表示され、「OK」を押すまでフローが一時停止します。手動作業を挟みたい時に使います。",
-                "fields": [
-                    {"name": "message", "label": "表示するメッセージ", "type": "str", "default": "準備ができたら「OK」を押してください"},
-                ],
-            },
-        ]
-
-        self._label_to_def = {d["label"]: d for d in self.action_defs}
-        self._id_to_def = {d["id"]: d for d in self.action_defs}
+        # アクション定義（モジュール定数を共有する）
+        self.action_defs = ACTION_DEFS
+        self._label_to_def = LABEL_TO_DEF
+        self._id_to_def = ID_TO_DEF
 
         self.action_label_var = tk.StringVar()
         self.on_error_var = tk.StringVar()
         self.help_text_var = tk.StringVar()
 
-        # name -> (tk.StringVar, field_dict)
-        self.field_vars: Dict[str, tuple[tk.StringVar, Dict[str, Any]]] = {}
+        # name -> (値の入れ物, Field, meta)
+        # 値の入れ物は StringVar か Entry（どちらも get() で読める）
+        # リソース系フィールドだけ meta に resource_type / keys / display_values を持つ
+        self.field_vars: Dict[str, tuple[tk.StringVar | ttk.Entry, Field, Optional[Dict[str, Any]]]] = {}
 
         self._create_widgets()
-        self.action_label_var.trace_add("write", lambda *args: self._on_action_changed())
+        self.action_label_var.trace_add("write", self._on_action_changed)
+
+        self.reset(initial_step, resources if resources is not None else {})
 
+    def reset(
+        self,
+        initial_step: Optional[Dict[str, Any]] = None,
+        resources: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """中身を initial_step（None なら新規）の状態に戻す。ウィジェットは作り直さない。
+
+        resources を渡したときだけリソース情報（サイト / ファイル）も差し替える。
+        """
+        self._result = None
+        if resources is not None:
+            self.resources: Dict[str, Any] = {
+                "sites": resources.get("sites") or {},
+                "files": resources.get("files") or {},
+            }
+
+        action_def = self.action_defs[0]
         if initial_step:
-            action_id = initial_step.get("action", "")
-            params = initial_step.get("params") or {}
-            action_def = self._id_to_def.get(action_id)
-            if action_def:
-                self.action_label_var.set(action_def["label"])
-            else:
-                self.action_label_var.set(self.action_defs[0]["label"])
-            if "on_error" in initial_step:
-                self.on_error_var.set(str(initial_step["on_error"]))
-            self._initial_params = params
+            action_def = self._id_to_def.get(initial_step.get("action", "")) or action_def
+            self.on_error_var.set(str(initial_step["on_error"]) if "on_error" in initial_step else "")
+            self._initial_params = initial_step.get("params") or {}
         else:
-            self.action_label_var.set(self.action_defs[0]["label"])
+            self.on_error_var.set("")
             self._initial_params = {}
 
-        self._on_action_changed()
+        # 書き込むと（同じ値でも）trace から _on_action_changed が呼ばれ、パラメータ欄が作り直される
+        self.action_label_var.set(action_def["label"])
+
+    def show_modal(self) -> Optional[Dict[str, Any]]:
+        """ダイアログを出して、OK / キャンセルで閉じられるまで待ち、結果を返す。"""
+        self._closed_var.set(False)
+        self.deiconify()
+        self.grab_set()  # モーダルっぽく
+        self.focus_set()
+        self.wait_variable(self._closed_var)
+        return self._result
+
+    def _close(self) -> None:
+        """破棄せずに隠す（次のステップ追加・編集で使い回す）。"""
+        self.grab_release()
+        self.withdraw()
+        self._closed_var.set(True)
 
     def _create_widgets(self) -> None:
         self.columnconfigure(1, weight=1)
@@ -812,7 +1335,7 @@ class StepEditor(tk.Toplevel):
             self,
             textvariable=self.action_label_var,
             state="readonly",
-            values=[d["label"] for d in self.action_defs],
+            values=ACTION_LABELS,
             width=40,
             style="Dialog.TCombobox",
         )
@@ -851,7 +1374,8 @@ class StepEditor(tk.Toplevel):
         ttk.Button(btn_frame, text="OK", command=self._on_ok, style="Dialog.TButton").grid(row=0, column=0, padx=4)
         ttk.Button(btn_frame, text="キャンセル", command=self._on_cancel, style="Dialog.TButton").grid(row=0, column=1, padx=4)
 
-    def _on_action_changed(self) -> None:
+    def _on_action_changed(self, *_: Any) -> None:
+        # trace_add から (name, index, mode) 付きで直接呼ばれる
         label = self.action_label_var.get().strip()
         action_def = self._label_to_def.get(label)
         if not action_def:
@@ -861,161 +1385,37 @@ class StepEditor(tk.Toplevel):
         self._current_action_id = action_def["id"]
         self.help_text_var.set(action_def.get("help", ""))
 
-        # パラメータ欄リセット
+        # パラメータ欄リセット（プールした Label/Entry は隠すだけで使い回す）
+        pooled_widgets = {w for pair in self._widget_pool.values() for w in pair}
+        for pooled_combo in self._resource_pool.values():
+            pooled_widgets.add(pooled_combo["label"])
+            pooled_widgets.add(pooled_combo["container"])
         for child in self.params_frame.winfo_children():
-            child.destroy()
+            if child in pooled_widgets:
+                child.grid_remove()
+            else:
+                child.destroy()
         self.field_vars.clear()
-        self._x_var = None
-        self._y_var = None
-
-        sites = self.resources.get("sites") or {}
-        files = self.resources.get("files") or {}
+        self._x_entry = None
+        self._y_entry = None
 
         for row, field in enumerate(action_def.get("fields", [])):
-            fname = field["name"]
-            flabel = field.get("label", fname)
-            default = field.get("default", "")
-
-            ttk.Label(self.params_frame, text=flabel).grid(
-                row=row, column=0, sticky="e", padx=4, pady=2
-            )
-
-            # --- resource.open_site: 表示名だけ見せるコンボ + 新規/編集 ---
-            if self._current_action_id == "resource.open_site" and fname == "key":
-                # keys -> displays (表示名 or key)
-                site_keys = sorted(sites.keys())
-                display_values = []
-                for k in site_keys:
-                    item = sites.get(k) or {}
-                    display_values.append(item.get("label") or k)
-
-                var = tk.StringVar()
-
-                # initial_params に key が入っているので、表示名に変換
-                if self._initial_params and fname in self._initial_params:
-                    key = str(self._initial_params[fname])
-                    item = sites.get(key) or {}
-                    disp = item.get("label") or key
-                    var.set(disp)
-                elif default:
-                    key = str(default)
-                    item = sites.get(key) or {}
-                    disp = item.get("label") or key
-                    if display_values:
-                        # defaultがリストにない場合もあるので、一応セット
-                        var.set(disp)
-                    else:
-                        var.set("")
-                elif display_values:
-                    var.set(display_values[0])
-                else:
-                    var.set("")
-
-                container = ttk.Frame(self.params_frame)
-                container.grid(row=row, column=1, sticky="ew", padx=4, pady=2)
-                container.columnconfigure(0, weight=1)
-
-                combo = ttk.Combobox(
-                    container,
-                    textvariable=var,
-                    values=display_values,
-                    state="readonly",
-                    width=30,
-                )
-                combo.grid(row=0, column=0, sticky="ew", padx=(0, 4))
-
-                # field情報にマッピングと種別を埋め込む
-                fcopy = dict(field)
-                fcopy["resource_type"] = "site"
-                fcopy["keys"] = site_keys
-                fcopy["display_values"] = display_values
-
-                ttk.Button(
-                    container,
-                    text="新規",
-                    command=lambda v=var, c=combo, fn=fname: self._open_site_resource_editor(
-                        v, c, fn, is_new=True
-                    ),
-                ).grid(row=0, column=1, padx=(0, 2))
-
-                ttk.Button(
-                    container,
-                    text="編集",
-                    command=lambda v=var, c=combo, fn=fname: self._open_site_resource_editor(
-                        v, c, fn, is_new=False
-                    ),
-                ).grid(row=0, column=2)
-
-                self.field_vars[fname] = (var, fcopy)
-                continue
-
-            # --- resource.open_file: 表示名だけ見せるコンボ + 新規/編集 ---
-            if self._current_action_id == "resource.open_file" and fname == "key":
-                file_keys = sorted(files.keys())
-                display_values = []
-                for k in file_keys:
-                    item = files.get(k) or {}
-                    display_values.append(item.get("label") or k)
-
-                var = tk.StringVar()
-
-                if self._initial_params and fname in self._initial_params:
-                    key = str(self._initial_params[fname])
-                    item = files.get(key) or {}
-                    disp = item.get("label") or key
-                    var.set(disp)
-                elif default:
-                    key = str(default)
-                    item = files.get(key) or {}
-                    disp = item.get("label") or key
-                    if display_values:
-                        var.set(disp)
-                    else:
-                        var.set("")
-                elif display_values:
-                    var.set(display_values[0])
-                else:
-                    var.set("")
-
-                container = ttk.Frame(self.params_frame)
-                container.grid(row=row, column=1, sticky="ew", padx=4, pady=2)
-                container.columnconfigure(0, weight=1)
-
-                combo = ttk.Combobox(
-                    container,
-                    textvariable=var,
-                    values=display_values,
-                    state="readonly",
-                    width=30,
-                )
-                combo.grid(row=0, column=0, sticky="ew", padx=(0, 4))
-
-                fcopy = dict(field)
-                fcopy["resource_type"] = "file"
-                fcopy["keys"] = file_keys
-                fcopy["display_values"] = display_values
-
-                ttk.Button(
-                    container,
-                    text="新規",
-                    command=lambda v=var, c=combo, fn=fname: self._open_file_resource_editor(
-                        v, c, fn, is_new=True
-                    ),
-                ).grid(row=0, column=1, padx=(0, 2))
-
-                ttk.Button(
-                    container,
-                    text="編集",
-                    command=lambda v=var, c=combo, fn=fname: self._open_file_resource_editor(
-                        v, c, fn, is_new=False
-                    ),
-                ).grid(row=0, column=2)
-
-                self.field_vars[fname] = (var, fcopy)
+            fname = field.name
+            flabel = field.label
+            default = field.default
+
+            # --- resource.open_site / open_file: 表示名だけ見せるコンボ + 新規/編集 ---
+            resource_kind = _RESOURCE_KEY_FIELDS.get((self._current_action_id, fname))
+            if resource_kind is not None:
+                self._show_resource_combo(resource_kind, row, field)
                 continue
 
             # --- run.program: program だけ「参照...」ボタン付き & D&D ---
             if self._current_action_id == "run.program" and fname == "program":
+                ttk.Label(self.params_frame, text=flabel).grid(
+                    row=row, column=0, sticky="e", padx=4, pady=2
+                )
+
                 var = tk.StringVar()
                 if self._initial_params and fname in self._initial_params:
                     var.set(str(self._initial_params[fname]))
@@ -1032,15 +1432,11 @@ class StepEditor(tk.Toplevel):
                 entry.grid(row=0, column=0, sticky="ew", padx=(0, 4))
 
                 if DND_AVAILABLE:
-                    def _on_drop(event, target_var=var) -> None:
-                        data = event.data
-                        if data.startswith("{") and data.endswith("}"):
-                            data = data[1:-1]
-                        target_var.set(data)
-
+                    # ハンドラは共通の1つを使い、書き込み先の変数はエントリ自身に持たせる
+                    entry._avantix_var = var  # type: ignore[attr-defined]
                     try:
                         entry.drop_target_register(DND_FILES)
-                        entry.dnd_bind("<<Drop>>", _on_drop)
+                        entry.dnd_bind("<<Drop>>", self._get_dnd_drop_cmd())
                     except Exception:
                         pass
 
@@ -1059,25 +1455,35 @@ class StepEditor(tk.Toplevel):
                     row=0, column=1, sticky="w"
                 )
 
-                self.field_vars[fname] = (var, field)
+                self.field_vars[fname] = (var, field, None)
                 continue
 
-            # --- デフォルト: 単純なテキスト入力 ---
-            var = tk.StringVar()
+            # --- デフォルト: 単純なテキスト入力（(name, type) ごとにプールして使い回す） ---
+            # trace しないので StringVar は使わず、Entry に直接読み書きする
+            pool_key = (fname, field.type)
+            pooled = self._widget_pool.get(pool_key)
+            if pooled is None:
+                lbl = ttk.Label(self.params_frame)
+                entry = ttk.Entry(self.params_frame)
+                self._widget_pool[pool_key] = (lbl, entry)
+            else:
+                lbl, entry = pooled
+
+            lbl.configure(text=flabel)
+            lbl.grid(row=row, column=0, sticky="e", padx=4, pady=2)
             if self._initial_params and fname in self._initial_params:
-                var.set(str(self._initial_params[fname]))
+                _set_entry_text(entry, str(self._initial_params[fname]))
             elif default is not None:
-                var.set(str(default))
+                _set_entry_text(entry, str(default))
             else:
-                var.set("")
-            entry = ttk.Entry(self.params_frame, textvariable=var)
+                _set_entry_text(entry, "")
             entry.grid(row=row, column=1, sticky="ew", padx=4, pady=2)
-            self.field_vars[fname] = (var, field)
+            self.field_vars[fname] = (entry, field, None)
 
             if fname == "x":
-                self._x_var = var
+                self._x_entry = entry
             if fname == "y":
-                self._y_var = var
+                self._y_entry = entry
 
             if self._current_action_id in ("ui.move", "ui.click", "ui.scroll") and fname == "x":
                 ttk.Button(
@@ -1088,6 +1494,107 @@ class StepEditor(tk.Toplevel):
 
         self._initial_params = {}
 
+    def _show_resource_combo(self, kind: str, row: int, field: Field) -> None:
+        """sites / files の key 欄（表示名のコンボ + 新規/編集ボタン）を row 行目に出す。
+
+        ウィジェットは種別ごとに1組だけ作って使い回し、values はキー一覧
+        （_sorted_resource_keys のタプル）が別物になったときだけ設定し直す。
+        """
+        fname = field.name
+        resource_type = "site" if kind == "sites" else "file"
+        items = self.resources.get(kind) or {}
+
+        pooled = self._resource_pool.get(kind)
+        if pooled is None:
+            open_editor = (
+                self._open_site_resource_editor
+                if resource_type == "site"
+                else self._open_file_resource_editor
+            )
+            lbl = ttk.Label(self.params_frame)
+            container = ttk.Frame(self.params_frame)
+            container.columnconfigure(0, weight=1)
+            var = tk.StringVar()
+            combo = ttk.Combobox(container, textvariable=var, state="readonly", width=30)
+            combo.grid(row=0, column=0, sticky="ew", padx=(0, 4))
+
+            ttk.Button(
+                container,
+                text="新規",
+                command=lambda v=var, c=combo, fn=fname: open_editor(v, c, fn, is_new=True),
+            ).grid(row=0, column=1, padx=(0, 2))
+
+            ttk.Button(
+                container,
+                text="編集",
+                command=lambda v=var, c=combo, fn=fname: open_editor(v, c, fn, is_new=False),
+            ).grid(row=0, column=2)
+
+            # keys: 最後に values を作ったときのキー一覧（同一オブジェクトなら作り直さない）
+            pooled = {"label": lbl, "container": container, "combo": combo, "var": var,
+                      "keys": None, "display_values": []}
+            self._resource_pool[kind] = pooled
+
+        keys = self._sorted_resource_keys(kind)
+        if pooled["keys"] is not keys:
+            display_values = [(items.get(k) or {}).get("label") or k for k in keys]
+            pooled["combo"].configure(values=display_values)
+            pooled["keys"] = keys
+            pooled["display_values"] = display_values
+        display_values = pooled["display_values"]
+
+        # initial_params に key が入っているので、表示名に変換
+        var = pooled["var"]
+        if self._initial_params and fname in self._initial_params:
+            key = str(self._initial_params[fname])
+            var.set((items.get(key) or {}).get("label") or key)
+        elif field.default:
+            key = str(field.default)
+            # defaultがリストにない場合もあるので、一応セット
+            var.set(((items.get(key) or {}).get("label") or key) if display_values else "")
+        elif display_values:
+            var.set(display_values[0])
+        else:
+            var.set("")
+
+        pooled["label"].configure(text=field.label)
+        pooled["label"].grid(row=row, column=0, sticky="e", padx=4, pady=2)
+        pooled["container"].grid(row=row, column=1, sticky="ew", padx=4, pady=2)
+
+        # 表示名 <-> key の対応と種別を meta に持たせる
+        meta = {"resource_type": resource_type, "keys": keys, "display_values": display_values}
+        self.field_vars[fname] = (var, field, meta)
+
+    def _sorted_resource_keys(self, kind: str) -> tuple[str, ...]:
+        """sites / files のキーをソートして返す。MainWindow と同じ dict を見ていればそのキャッシュを使う。"""
+        items = self.resources.get(kind) or {}
+        master = self.master
+        getter = getattr(master, "_sorted_resource_keys", None)
+        if callable(getter) and (getattr(master, "resources", None) or {}).get(kind) is items:
+            return getter(kind)
+        return tuple(sorted(items))
+
+    def _get_dnd_drop_cmd(self) -> str:
+        """<<Drop>> 用の Tcl コマンドをこのダイアログで1回だけ登録して返す。
+
+        tkdnd はウィジェット自身の <<Drop>> バインドしか見ない（bindtags は使われない）ので、
+        バインドは各エントリに付けるが、呼び出す関数は毎回作らずに共有する。
+        """
+        if self._dnd_drop_cmd is None:
+            funcid = self._register(StepEditor._on_dnd_drop, self._substitute_dnd)
+            self._dnd_drop_cmd = f"{funcid} {self._subst_format_str_dnd}"
+        return self._dnd_drop_cmd
+
+    @staticmethod
+    def _on_dnd_drop(event) -> None:
+        target_var = getattr(event.widget, "_avantix_var", None)
+        if target_var is None:
+            return
+        data = event.data
+        if data.startswith("{") and data.endswith("}"):
+            data = data[1:-1]
+        target_var.set(data)
+
     # ---- resources 保存ヘルパー ----
     def _save_resources_from_editor(self) -> None:
         master = self.master
@@ -1110,9 +1617,10 @@ class StepEditor(tk.Toplevel):
         sites = self.resources.setdefault("sites", {})
 
         # 現在のフィールド情報（keys / display_values）を取る
-        var, fdict = self.field_vars.get(field_name, (target_var, {}))
-        keys: List[str] = list(fdict.get("keys") or [])
-        displays: List[str] = list(fdict.get("display_values") or [])
+        var, _field, meta = self.field_vars.get(field_name, (target_var, None, None))
+        meta = meta or {}
+        keys: List[str] = list(meta.get("keys") or [])
+        displays: List[str] = list(meta.get("display_values") or [])
 
         # 編集モードなら、現在選択中の表示名から key を逆引き
         current_key: Optional[str] = None
@@ -1181,17 +1689,25 @@ class StepEditor(tk.Toplevel):
                 return
 
             master = self.master
-            fetch_title = getattr(master, "_fetch_title_from_url", None)
+            fetch_title_async = getattr(master, "_fetch_title_async", None)
             guess_label = getattr(master, "_guess_label_from_url", None)
 
-            title = fetch_title(url) if callable(fetch_title) else None
-            if title:
-                label_var.set(title)
-                return
+            def _on_title(title: Optional[str]) -> None:
+                # 取得中にダイアログが閉じられた / URL や表示名が変わったなら何もしない
+                if not top.winfo_exists() or url_var.get().strip() != url or label_var.get().strip():
+                    return
+                if title:
+                    label_var.set(title)
+                    return
 
-            guess = guess_label(url) if callable(guess_label) else None
-            if guess:
-                label_var.set(guess)
+                guess = guess_label(url) if callable(guess_label) else None
+                if guess:
+                    label_var.set(guess)
+
+            if callable(fetch_title_async):
+                fetch_title_async(url, _on_title)
+            else:
+                _on_title(None)
 
         url_var.trace_add("write", _schedule_auto_fill)
 
@@ -1225,9 +1741,10 @@ class StepEditor(tk.Toplevel):
 
             # 対応フィールドのメタデータを更新
             if field_name in self.field_vars:
-                v2, f2 = self.field_vars[field_name]
-                f2["keys"] = new_keys
-                f2["display_values"] = new_displays
+                v2, _f2, meta2 = self.field_vars[field_name]
+                if meta2 is not None:
+                    meta2["keys"] = new_keys
+                    meta2["display_values"] = new_displays
 
             combo["values"] = new_displays
             # 今追加/更新したものの表示名を選択
@@ -1269,9 +1786,10 @@ class StepEditor(tk.Toplevel):
     ) -> None:
         files = self.resources.setdefault("files", {})
 
-        var, fdict = self.field_vars.get(field_name, (target_var, {}))
-        keys: List[str] = list(fdict.get("keys") or [])
-        displays: List[str] = list(fdict.get("display_values") or [])
+        var, _field, meta = self.field_vars.get(field_name, (target_var, None, None))
+        meta = meta or {}
+        keys: List[str] = list(meta.get("keys") or [])
+        displays: List[str] = list(meta.get("display_values") or [])
 
         current_key: Optional[str] = None
         if not is_new:
@@ -1385,9 +1903,10 @@ class StepEditor(tk.Toplevel):
                 new_displays.append(item.get("label") or k)
 
             if field_name in self.field_vars:
-                v2, f2 = self.field_vars[field_name]
-                f2["keys"] = new_keys
-                f2["display_values"] = new_displays
+                v2, _f2, meta2 = self.field_vars[field_name]
+                if meta2 is not None:
+                    meta2["keys"] = new_keys
+                    meta2["display_values"] = new_displays
 
             combo["values"] = new_displays
             disp_new = files[key].get("label") or key
@@ -1417,13 +1936,13 @@ class StepEditor(tk.Toplevel):
         path_entry.focus_set()
 
     def _capture_xy(self) -> None:
-        if self._x_var is None or self._y_var is None:
+        if self._x_entry is None or self._y_entry is None:
             messagebox.showerror("エラー", "X座標 / Y座標フィールドが見つかりません。", parent=self)
             return
 
         parent = self
 
-        class InlineCapture(tk.Toplevel):
+        class InlineCapture(_PointerCaptureWindow):
             def __init__(self, owner: StepEditor) -> None:
                 super().__init__(owner)
                 self.owner = owner
@@ -1453,26 +1972,16 @@ class StepEditor(tk.Toplevel):
                 self.bind("<Return>", lambda e: self._finish())
                 self.bind("<space>", lambda e: self._finish())
 
-                self._update_position()
+                self._start_position_polling()
                 self.grab_set()
                 self.focus_set()
 
-            def _update_position(self) -> None:
-                try:
-                    x = self.winfo_pointerx()
-                    y = self.winfo_pointery()
-                    self.pos_label.config(text=f"現在の座標: x={x}, y={y}")
-                except Exception:
-                    pass
-                self.after(100, self._update_position)
-
             def _finish(self) -> None:
-                x = self.winfo_pointerx()
-                y = self.winfo_pointery()
-                if parent._x_var is not None:
-                    parent._x_var.set(str(x))
-                if parent._y_var is not None:
-                    parent._y_var.set(str(y))
+                x, y = self._current_xy()
+                if parent._x_entry is not None:
+                    _set_entry_text(parent._x_entry, str(x))
+                if parent._y_entry is not None:
+                    _set_entry_text(parent._y_entry, str(y))
                 self.destroy()
                 parent.deiconify()
                 parent.lift()
@@ -1491,22 +2000,22 @@ class StepEditor(tk.Toplevel):
         action_id = action_def["id"]
         params: Dict[str, Any] = {}
 
-        for fname, (var, field) in self.field_vars.items():
+        for fname, (var, field, meta) in self.field_vars.items():
             raw = var.get().strip()
-            ftype = field.get("type", "str")
-            optional = field.get("optional", False)
+            ftype = field.type
+            optional = field.optional
 
             if raw == "":
                 if optional:
                     continue
-                messagebox.showwarning("入力不足", f"「{field.get('label', fname)}」を入力してください。", parent=self)
+                messagebox.showwarning("入力不足", f"「{field.label}」を入力してください。", parent=self)
                 return
 
             # ★ リソース系だけ、表示名→キーへの変換を挟む
-            rtype = field.get("resource_type")
+            rtype = meta.get("resource_type") if meta else None
             if rtype in ("site", "file"):
-                displays = field.get("display_values") or []
-                keys = field.get("keys") or []
+                displays = meta.get("display_values") or []
+                keys = meta.get("keys") or []
                 value: Any = raw
                 if displays and keys and len(displays) == len(keys):
                     try:
@@ -1523,6 +2032,8 @@ class StepEditor(tk.Toplevel):
                     value = int(raw)
                 elif ftype == "float":
                     value = float(raw)
+                elif ftype == "bool":
+                    value = as_bool(raw)
                 elif ftype == "list_str":
                     value = [x.strip() for x in raw.split(",") if x.strip()]
                 else:
@@ -1530,7 +2041,7 @@ class StepEditor(tk.Toplevel):
             except ValueError:
                 messagebox.showerror(
                     "形式エラー",
-                    f"「{field.get('label', fname)}」の値が不正です。",
+                    f"「{field.label}」の値が不正です。",
                     parent=self,
                 )
                 return
@@ -1543,11 +2054,11 @@ class StepEditor(tk.Toplevel):
             step["on_error"] = oe
 
         self._result = step
-        self.destroy()
+        self._close()
 
     def _on_cancel(self) -> None:
         self._result = None
-        self.destroy()
+        self._close()
 
     def get_result(self) -> Optional[Dict[str, Any]]:
         return self._result
@@ -1576,7 +2087,7 @@ class StepEditor(tk.Toplevel):
         style.configure("Dialog.TCombobox", fieldbackground=entry_bg, foreground=fg)
 
 
-class CoordinateCapture(tk.Toplevel):
+class CoordinateCapture(_PointerCaptureWindow):
     """
     画面上でマウスを動かして、Enterキーを押した時点の座標を取得する。
     """
@@ -1612,22 +2123,12 @@ class CoordinateCapture(tk.Toplevel):
         self.bind("<Return>", lambda e: self._finish())
         self.bind("<space>", lambda e: self._finish())
 
-        self._update_position()
+        self._start_position_polling()
         self.grab_set()
         self.focus_set()
 
-    def _update_position(self) -> None:
-        try:
-            x = self.winfo_pointerx()
-            y = self.winfo_pointery()
-            self.pos_label.config(text=f"現在の座標: x={x}, y={y}")
-        except Exception:
-            pass
-        self.after(100, self._update_position)
-
     def _finish(self) -> None:
-        x = self.winfo_pointerx()
-        y = self.winfo_pointery()
+        x, y = self._current_xy()
         try:
             self.clipboard_clear()
             self.clipboard_append(f"{x},{y}")
@@ -1637,6 +2138,8 @@ class CoordinateCapture(tk.Toplevel):
 
 # D&D が使える環境なら TkinterDnD.Tk を継承、それ以外は普通の tk.Tk
 class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
+    LOG_MAX_LINES = 5000  # 実行ログに残す最大行数（超えたら古い行から消す）
+    _flows_dir_ready = False  # FLOWS_DIR を作成（確認）済みか（_ensure_flows_dir）
 
     def __init__(self) -> None:
         super().__init__()
@@ -1714,6 +2217,9 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         self.engine = Engine(BUILTIN_ACTIONS)
         self._running_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()  # ★ 中断用イベント
+        self._save_in_flight = False  # フロー保存スレッドが動いている間は True
+        self._editor_load_gen = 0  # エディタへのフロー読み込みの世代（_editor_load_from_path 参照）
+        self._editor_loading_path: Optional[Path] = None  # 読み込み中のフロー（無ければ None）
         
         # 工程プレビュー表示用：アクションID → 日本語ラベル
         self._action_id_to_label = {
@@ -1732,14 +2238,48 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             "file.move": "ファイルを移動する",
         }
         
-        self.resources: Dict[str, Any] = self._load_resources()
+        # sites / files の dict は resources の setter で _sites_bucket / _files_bucket に取り出す
+        self.resources = self._load_resources()
+        # sites / files のソート済みキー（_save_resources で破棄する）
+        self._sorted_keys_cache: Dict[str, tuple[str, ...]] = {}
+        # リソースタブの一覧の並び順どおりのキー（_refresh_site_list / _refresh_file_list で作り直し、
+        # 保存・削除のたびに _update_resource_row で1行ずつ更新する）
+        self._site_keys: List[str] = []
+        self._file_keys: List[str] = []
+        # URL タイトル取得などのネットワーク処理用（UI スレッドを止めない）
+        self._net_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="avantixrpa-net")
+        # フロー一覧の YAML を裏で読む用（_prefetch_flow_meta）
+        self._flow_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="avantixrpa-flows")
+        # _generate_resource_key 用: (prefix, base) -> 次に試す連番
+        self._keycount: Dict[tuple[str, str], int] = {}
+        # _debounce 用: キー -> 締め切り（time.monotonic()）。タイマー待ちの間だけ入っている
+        self._debounce_deadlines: Dict[str, float] = {}
         self._flow_entries: List[Dict[str, Any]] = []
+        # フロー YAML の読み込みキャッシュ: パス -> ((st_mtime_ns, st_size), name / enabled / description / steps)
+        self._flow_meta_cache: Dict[Path, tuple[tuple[int, int], Dict[str, Any]]] = {}
+        # 見えている行の読み込みを after_idle で予約済みか
+        self._flow_parse_pending = False
+        # _load_flows_list のたびに増やす（古い一覧向けの裏読み結果を捨てる）
+        self._flow_load_gen = 0
+        # 実行ログ: 書き込み待ちの (行, タグ) と、_flush_log を予約済みか
+        self._log_queue: deque[tuple[str, tuple[str, ...]]] = deque()
+        self._log_flush_scheduled = False
 
         # フロー編集用
         self.edit_flow_name_var = tk.StringVar()
-        self.edit_on_error_var = tk.StringVar()
+        self.edit_on_error_var = tk.StringVar(value="stop")
         self.edit_flow_description_var = tk.StringVar()  # ★ フロー説明（1行）用
         self.edit_steps: List[Dict[str, Any]] = []
+        # 読み込み中に名前・説明・エラー方針を手で変えたら、届いた読み込み結果で上書きしない
+        for var in (self.edit_flow_name_var, self.edit_on_error_var, self.edit_flow_description_var):
+            var.trace_add("write", self._mark_editor_edited)
+        # ステップ表示文字列（番号を除いた部分）のキャッシュ: id(step) -> (step, 文字列)
+        # step 本体も持っておくことで、消えた dict の id が使い回されても取り違えない
+        self._step_label_cache: Dict[int, tuple[Dict[str, Any], str]] = {}
+        # フロー編集タブを作るまでは None（_ensure_tab_built 参照）
+        self.edit_steps_list: Optional[DraggableStepList] = None
+        # ステップ編集ダイアログ（初回に作って隠したまま使い回す。_open_step_editor 参照）
+        self._step_editor: Optional[StepEditor] = None
 
         # ★ 追加：今編集中のフロー(YAML)のパス（新規のときは None）
         self.current_edit_flow_path: Optional[Path] = None
@@ -1750,6 +2290,8 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         self._create_widgets()
         self._load_flows_list()
+        if not YAML_C_AVAILABLE:
+            self._append_log("[INFO] libyaml が見つからないため、フローの読み書きに純 Python 版の YAML パーサを使います")
 
     def _load_settings(self) -> Dict[str, Any]:
         """設定ファイルを読み込む。"""
@@ -1931,6 +2473,17 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                 except Exception:
                     pass
 
+    @property
+    def resources(self) -> Dict[str, Any]:
+        return self._resources
+
+    @resources.setter
+    def resources(self, value: Dict[str, Any]) -> None:
+        # StepEditor から丸ごと差し替えられることもあるので、そのたびに取り直す
+        self._resources = value
+        self._sites_bucket: Dict[str, Any] = value.setdefault("sites", {})
+        self._files_bucket: Dict[str, Any] = value.setdefault("files", {})
+
     def _load_resources(self) -> Dict[str, Any]:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         if not RESOURCES_FILE.exists():
@@ -1938,8 +2491,8 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                 json.dump(DEFAULT_RESOURCES, f, ensure_ascii=False, indent=2)
             return DEFAULT_RESOURCES.copy()
         try:
-            with RESOURCES_FILE.open("r", encoding="utf-8") as f:
-                data = json.load(f)
+            raw = RESOURCES_FILE.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
             if not isinstance(data, dict):
                 raise ValueError("Invalid resources.json format")
 
@@ -1981,22 +2534,46 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         - 日本語などは落ちるので、全部 ASCII にできなかった場合は prefix ベースで作る
         - 既存のキーと被る場合は _2, _3... を付けてずらす
         """
-        text = unicodedata.normalize("NFKC", label)
-        ascii_text = text.encode("ascii", "ignore").decode("ascii").lower()
-        ascii_text = re.sub(r"[^a-z0-9]+", "_", ascii_text).strip("_")
+        if label.isascii():
+            # ASCII だけなら NFKC 正規化も ASCII への変換も不要
+            ascii_text = label.lower()
+        else:
+            text = unicodedata.normalize("NFKC", label)
+            ascii_text = text.encode("ascii", "ignore").decode("ascii").lower()
+        ascii_text = _KEY_INVALID_RE.sub("_", ascii_text).strip("_")
 
         base = ascii_text or prefix  # ぜんぶ消えたら prefix を使う（site, file など）
         key = base
-        i = 2
-        while key in existing:
+        if key in existing:
+            # 前回使った番号の次から探す（毎回 _2 から数え直さない）
+            count_key = (prefix, base)
+            i = self._keycount.get(count_key, 2)
             key = f"{base}_{i}"
-            i += 1
+            while key in existing:
+                i += 1
+                key = f"{base}_{i}"
+            self._keycount[count_key] = i + 1
         return key
 
+    def _sorted_resource_keys(self, kind: str) -> tuple[str, ...]:
+        """resources の sites / files のキーをソートして返す（保存されるまでキャッシュ）。"""
+        keys = self._sorted_keys_cache.get(kind)
+        if keys is None:
+            keys = tuple(sorted(self.resources.get(kind) or {}))
+            self._sorted_keys_cache[kind] = keys
+        return keys
+
     def _save_resources(self) -> None:
+        # sites / files が変わっているはずなのでソート済みキーは作り直す
+        self._sorted_keys_cache.clear()
+        # リソースの表示名はステップの表示文字列にも使われている
+        self._step_label_cache.clear()
         try:
-            with RESOURCES_FILE.open("w", encoding="utf-8") as f:
-                json.dump(self.resources, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                raw = orjson.dumps(self.resources, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                raw = json.dumps(self.resources, ensure_ascii=False, indent=2).encode("utf-8")
+            RESOURCES_FILE.write_bytes(raw)
         except Exception as exc:
             messagebox.showerror("リソース保存エラー", f"resources.json の保存に失敗しました。\n{exc}")
 
@@ -2066,9 +2643,13 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         self.notebook.add(self.resource_tab, text="リソース管理")
         self.notebook.add(self.editor_tab, text="フローを作成・編集")
 
-        self._create_flow_tab(self.flow_tab)
-        self._create_resource_tab(self.resource_tab)
-        self._create_flow_editor_tab(self.editor_tab)
+        self._build_tab(self.flow_tab, self._create_flow_tab)
+        # リソース管理 / フロー編集タブの中身は、初めて表示されたときに作る
+        self._lazy_tabs = {
+            str(self.resource_tab): self._create_resource_tab,
+            str(self.editor_tab): self._create_flow_editor_tab,
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         status_frame = ttk.Frame(self, padding=(8, 2), style="Main.TFrame")
         status_frame.grid(row=2, column=0, sticky="ew")
@@ -2112,6 +2693,30 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             self._apply_theme()
             self._update_logo()
 
+    def _build_tab(self, tab: ttk.Frame, builder) -> None:
+        """タブの中身を作る。作っている間はタブのサイズ伝播を止めておき、最後に1回だけ戻す。
+
+        途中で update() / update_idletasks() は呼ばない（レイアウト計算は mainloop のアイドル時に1回で済ませる）。
+        """
+        tab.grid_propagate(False)
+        try:
+            builder(tab)
+        finally:
+            tab.grid_propagate(True)
+
+    def _on_tab_changed(self, event=None) -> None:
+        self._ensure_tab_built(self.notebook.select())
+
+    def _ensure_tab_built(self, tab) -> None:
+        """まだ中身を作っていないタブなら作る。"""
+        builder = self._lazy_tabs.pop(str(tab), None)
+        if builder is None:
+            return
+        self._build_tab(self.nametowidget(str(tab)), builder)
+        # Listbox など ttk 以外のウィジェットは作った後で色を合わせる
+        if self._dark_mode:
+            self._apply_theme()
+
     def _setup_keyboard_shortcuts(self) -> None:
         """キーボードショートカットを設定する。"""
         # ファイル操作系
@@ -2190,7 +2795,13 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         scrollbar = ttk.Scrollbar(left_frame, orient="vertical", command=self.flows_listbox.yview)
         scrollbar.grid(row=1, column=1, sticky="ns")
-        self.flows_listbox.config(yscrollcommand=scrollbar.set)
+
+        def _on_flows_yscroll(first: str, last: str) -> None:
+            scrollbar.set(first, last)
+            # スクロール・リサイズで新しく見えた行の YAML を読む
+            self._schedule_parse_visible_flows()
+
+        self.flows_listbox.config(yscrollcommand=_on_flows_yscroll)
 
         # ダブルクリックで実行
         self.flows_listbox.bind("<Double-Button-1>", self._on_flow_double_click)
@@ -2272,7 +2883,6 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         self.site_key_var = tk.StringVar()
         self.site_label_var = tk.StringVar()
         self.site_url_var = tk.StringVar()
-        self._site_title_after_id = None  # URL変更時の after() 用
 
         ttk.Entry(site_frame, textvariable=self.site_label_var).grid(
             row=0, column=1, sticky="ew", padx=4, pady=2
@@ -2311,7 +2921,6 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         self.file_key_var = tk.StringVar()
         self.file_label_var = tk.StringVar()
         self.file_path_var = tk.StringVar()
-        self._file_title_after_id = None  # パス変更時 after() 用
 
         ttk.Entry(file_frame, textvariable=self.file_label_var).grid(
             row=1, column=1, sticky="ew", padx=4, pady=2
@@ -2382,7 +2991,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             width=10,
         )
         on_error_combo.grid(row=1, column=1, sticky="w", padx=4, pady=2)
-        on_error_combo.set("stop")
+        # 初期値 "stop" は edit_on_error_var 側で持つ（タブ作成前に読み込んだフローの値を消さないため）
 
         ttk.Label(top_frame, text="説明（任意）").grid(row=2, column=0, sticky="e", padx=4, pady=2)
         ttk.Entry(top_frame, textvariable=self.edit_flow_description_var).grid(
@@ -2403,7 +3012,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         # ★ 右クリックでコンテキストメニュー表示
         def _show_step_context(event, index):
-            self.step_context_menu.tk_popup(event.x_root, event.y_root)
+            self._show_context_menu(self.step_context_menu, event)
         self.edit_steps_list.set_on_right_click(_show_step_context)
 
         # ★ 並び替え時のコールバック
@@ -2411,6 +3020,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             if from_idx < len(self.edit_steps) and to_idx <= len(self.edit_steps):
                 step = self.edit_steps.pop(from_idx)
                 self.edit_steps.insert(to_idx, step)
+                self._mark_editor_edited()
         self.edit_steps_list.set_on_reorder(_on_reorder)
 
         # ★ ステップ用の右クリックメニュー
@@ -2471,43 +3081,50 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         self._refresh_edit_steps_list()
 
     def _load_flows_list(self) -> None:
+        """flows/*.yaml を一覧に並べる。
+
+        中身（name など）はキャッシュにあるものだけ使い、残りは仮にファイル名で表示しておいて
+        ワーカースレッドで読む（_prefetch_flow_meta）。見えている行・選択された行は
+        待たずにその場で読む（_ensure_flow_parsed）。
+        """
         self.flows_listbox.delete(0, tk.END)
         self._flow_entries.clear()
 
-        FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+        # 再読み込みのときは毎回フォルダの有無を確かめ直す
+        MainWindow._flows_dir_ready = False
+        self._ensure_flows_dir()
+
+        old_cache = self._flow_meta_cache
+        self._flow_meta_cache = {}
+        # scandir の DirEntry は stat 結果を持っている（Windows では追加のシステムコール無し）
+        with os.scandir(FLOWS_DIR) as it:
+            dir_entries = sorted(
+                (e for e in it if e.name.endswith(".yaml") and e.is_file()),
+                key=lambda e: e.name,
+            )
 
-        yaml_files = sorted(FLOWS_DIR.glob("*.yaml"))
-        for p in yaml_files:
-            description = ""
-            steps_raw: List[Dict[str, Any]] = []
+        labels: List[str] = []
+        for e in dir_entries:
             try:
-                with p.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f) or {}
-                if not isinstance(data, dict):
-                    raise ValueError("root is not mapping")
-                name = data.get("name") or p.stem
-                enabled = data.get("enabled", True)
-                description = data.get("description") or ""
-                steps_raw = data.get("steps") or []
-            except Exception:
-                name = p.stem
-                enabled = True
-                description = ""
-                steps_raw = []
-
-            self._flow_entries.append(
-                {
-                    "name": name,
-                    "file": p,
-                    "enabled": enabled,
-                    "description": description,
-                    "steps": steps_raw,
-                }
-            )
+                st = e.stat()
+            except OSError:
+                continue
+            token = (st.st_mtime_ns, st.st_size)
+            p = Path(e.path)
 
-            # 表示はフロー名だけにする（ファイル名 *.yaml は隠す）
-            flow_name = name if enabled else f"[無効] {name}"
-            self.flows_listbox.insert(tk.END, flow_name)
+            cached = old_cache.get(p)
+            if cached is not None and cached[0] == token:
+                self._flow_meta_cache[p] = cached
+                entry = dict(cached[1], file=p)
+            else:
+                entry = self._unparsed_flow_entry(p, token)
+
+            self._flow_entries.append(entry)
+            labels.append(self._flow_list_label(entry))
+
+        if labels:
+            self.flows_listbox.insert(tk.END, *labels)
+        self._prefetch_flow_meta()
 
         self._append_log(f"[INFO] フロー一覧を読み込みました ({len(self._flow_entries)} 件)")
         self.status_label.config(text="フロー一覧を更新しました")
@@ -2519,6 +3136,135 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             self._on_flow_selection_changed()
 
 
+    def _ensure_flows_dir(self) -> None:
+        """FLOWS_DIR を作る。作成済みならシステムコールはしない。"""
+        if not MainWindow._flows_dir_ready:
+            FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+            MainWindow._flows_dir_ready = True
+
+    @staticmethod
+    def _unparsed_flow_entry(p: Path, token: tuple[int, int]) -> Dict[str, Any]:
+        # name が None の間は未読み込み（stat は読み込み時のキャッシュキーに使う）
+        return {"name": None, "file": p, "enabled": True, "description": "", "steps": [], "stat": token}
+
+    def _upsert_flow_row(self, p: Path) -> int:
+        """書き込んだフロー p の行だけを一覧に反映して、その行番号を返す（一覧全体は読み直さない）。"""
+        st = p.stat()
+        entry = self._unparsed_flow_entry(p, (st.st_mtime_ns, st.st_size))
+        # 一覧はファイル名順（_load_flows_list と同じ並び）
+        idx = bisect.bisect_left(self._flow_entries, p.name, key=lambda e: e["file"].name)
+        if idx < len(self._flow_entries) and self._flow_entries[idx]["file"] == p:
+            self._flow_entries[idx] = entry
+        else:
+            self._flow_entries.insert(idx, entry)
+            self.flows_listbox.insert(idx, p.stem)
+        self._ensure_flow_parsed(idx)
+        return idx
+
+    def _remove_flow_row(self, idx: int) -> None:
+        entry = self._flow_entries.pop(idx)
+        self._flow_meta_cache.pop(entry["file"], None)
+        self.flows_listbox.delete(idx)
+
+    @staticmethod
+    def _flow_list_label(entry: Dict[str, Any]) -> str:
+        # 表示はフロー名だけにする（ファイル名 *.yaml は隠す）。未読み込みならファイル名
+        name = entry["name"] if entry["name"] is not None else entry["file"].stem
+        return name if entry["enabled"] else f"[無効] {name}"
+
+    @staticmethod
+    def _read_flow_meta(p: Path) -> Dict[str, Any]:
+        """フロー YAML から一覧・詳細表示に使う項目だけを取り出す。"""
+        try:
+            with p.open("r", encoding="utf-8") as f:
+                data = yaml.load(f, Loader=_YamlLoader) or {}
+            if not isinstance(data, dict):
+                raise ValueError("root is not mapping")
+            return {
+                "name": data.get("name") or p.stem,
+                "enabled": data.get("enabled", True),
+                "description": data.get("description") or "",
+                "steps": data.get("steps") or [],
+            }
+        except Exception:
+            return {"name": p.stem, "enabled": True, "description": "", "steps": []}
+
+    def _ensure_flow_parsed(self, idx: int) -> Dict[str, Any]:
+        """idx 行目のフローがまだ読み込まれていなければ読み込み、一覧の表示も差し替える。"""
+        entry = self._flow_entries[idx]
+        if entry["name"] is None:
+            self._apply_flow_meta(idx, self._read_flow_meta(entry["file"]))
+        return entry
+
+    def _apply_flow_meta(self, idx: int, meta: Dict[str, Any]) -> None:
+        """読み込んだ meta を idx 行目（未読み込み）に反映し、キャッシュと一覧の表示も更新する。"""
+        entry = self._flow_entries[idx]
+        self._flow_meta_cache[entry["file"]] = (entry.pop("stat"), meta)
+        entry.update(meta)
+
+        label = self._flow_list_label(entry)
+        lb = self.flows_listbox
+        if lb.get(idx) != label:
+            selected = lb.selection_includes(idx)
+            lb.delete(idx)
+            lb.insert(idx, label)
+            if selected:
+                lb.selection_set(idx)
+
+    def _flow_row_index(self, entry: Dict[str, Any]) -> Optional[int]:
+        """entry が今の一覧の何行目か（もう一覧に無ければ None）。"""
+        idx = bisect.bisect_left(self._flow_entries, entry["file"].name, key=lambda e: e["file"].name)
+        if idx < len(self._flow_entries) and self._flow_entries[idx] is entry:
+            return idx
+        return None
+
+    def _prefetch_flow_meta(self) -> None:
+        """未読み込みのフローをワーカースレッドで読んでおき、読めたものから一覧に反映する。"""
+        self._flow_load_gen += 1
+        pending = [
+            (entry, self._flow_pool.submit(self._read_flow_meta, entry["file"]))
+            for entry in self._flow_entries
+            if entry["name"] is None
+        ]
+        if pending:
+            self.after(50, self._drain_flow_prefetch, self._flow_load_gen, pending)
+
+    def _drain_flow_prefetch(self, gen: int, pending: List[tuple[Dict[str, Any], Future]]) -> None:
+        if gen != self._flow_load_gen:
+            # 一覧が読み直されたので、残りは不要
+            for _, future in pending:
+                future.cancel()
+            return
+
+        rest = []
+        for entry, future in pending:
+            if not future.done():
+                rest.append((entry, future))
+                continue
+            # 見えている行・選択された行は先に読み込み済みのことがある
+            if entry["name"] is None:
+                idx = self._flow_row_index(entry)
+                if idx is not None:
+                    self._apply_flow_meta(idx, future.result())
+        if rest:
+            self.after(50, self._drain_flow_prefetch, gen, rest)
+
+    def _schedule_parse_visible_flows(self) -> None:
+        if not self._flow_parse_pending:
+            self._flow_parse_pending = True
+            self.after_idle(self._parse_visible_flows)
+
+    def _parse_visible_flows(self) -> None:
+        """フロー一覧で今見えている範囲の行だけ読み込む。"""
+        self._flow_parse_pending = False
+        lb = self.flows_listbox
+        if not self._flow_entries:
+            return
+        first = lb.nearest(0)
+        last = min(lb.nearest(lb.winfo_height()), len(self._flow_entries) - 1)
+        for idx in range(first, last + 1):
+            self._ensure_flow_parsed(idx)
+
     def _append_log(self, message: str) -> None:
         """
         実行ログをテキストエリアに追記する。
@@ -2535,12 +3281,31 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         ts = datetime.now().strftime("%H:%M:%S")
         line = f"{ts} {message}"
 
+        # レベルタグがあれば、そのタグで色分け
+        self._log_queue.append((line + "\n", (level_tag,) if level_tag else ()))
+        if not self._log_flush_scheduled:
+            # 続けて来たログはまとめて 1 回で書き込む
+            self._log_flush_scheduled = True
+            self.after(_LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self) -> None:
+        """溜まったログ行を 1 回の insert で書き込み、末尾へのスクロールも 1 回だけにする。"""
+        self._log_flush_scheduled = False
+        if not self._log_queue:
+            return
+        # Text.insert は (文字列, タグ) の組を続けて渡せる
+        args: List[Any] = []
+        for chunk, tags in self._log_queue:
+            args.append(chunk)
+            args.append(tags)
+        self._log_queue.clear()
+
         self.log_text.config(state="normal")
-        if level_tag:
-            # レベルタグがあれば、そのタグで色分け
-            self.log_text.insert(tk.END, line + "\n", (level_tag,))
-        else:
-            self.log_text.insert(tk.END, line + "\n")
+        self.log_text.insert(tk.END, *args)
+        # 末尾は改行なので、最後の行番号 - 1 が実際の行数
+        lines = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if lines > self.LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{lines - self.LOG_MAX_LINES + 1}.0")
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
 
@@ -2567,7 +3332,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                 self.flow_detail_text.configure(state="disabled")
             return
 
-        entry = self._flow_entries[idx]
+        entry = self._ensure_flow_parsed(idx)
         description: str = entry.get("description") or ""
         steps = entry.get("steps") or []
 
@@ -2608,24 +3373,34 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             # 万一 Text がまだ無い場合の保険（古い UI でも落ちないように）
             self.flow_detail_var.set(text)
 
-    def _on_edit_flow_from_list(self) -> None:
-        """フロー一覧で選択中のフローを、フローエディタタブで開く。"""
+    def _get_selected_flow(self, action_label: str) -> Optional[tuple[int, Dict[str, Any]]]:
+        """フロー一覧で選択中の (行番号, エントリ) を返す。
+
+        未選択・一覧とのずれ・ファイルが無いときはメッセージを出して None を返す。
+        action_label はメッセージ用の「実行する」「編集する」など。
+        """
         selection = self.flows_listbox.curselection()
         if not selection:
-            messagebox.showwarning("フロー未選択", "編集するフローを一覧から選択してください。")
-            return
+            messagebox.showwarning("フロー未選択", f"{action_label}フローを一覧から選択してください。")
+            return None
 
         idx = selection[0]
         if idx >= len(self._flow_entries):
-            messagebox.showerror("エラー", "内部のフロー一覧と表示がずれています。")
-            return
+            messagebox.showerror("エラー", "内部データと表示がずれています。")
+            return None
 
-        entry = self._flow_entries[idx]
-        flow_path: Path = entry["file"]
+        entry = self._ensure_flow_parsed(idx)
+        if not entry["file"].exists():
+            messagebox.showerror("ファイルなし", f"フローファイルが見つかりません:\n{entry['file']}")
+            return None
+        return idx, entry
 
-        if not flow_path.exists():
-            messagebox.showerror("ファイルなし", f"フローファイルが見つかりません:\n{flow_path}")
+    def _on_edit_flow_from_list(self) -> None:
+        """フロー一覧で選択中のフローを、フローエディタタブで開く。"""
+        selected = self._get_selected_flow("編集する")
+        if selected is None:
             return
+        flow_path: Path = selected[1]["file"]
 
         # 実際の読み込みロジックに委譲
         self._editor_load_from_path(flow_path)
@@ -2651,23 +3426,11 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             messagebox.showinfo("実行中", "現在フロー実行中です。完了をお待ちください。")
             return
 
-        selection = self.flows_listbox.curselection()
-        if not selection:
-            messagebox.showwarning("フロー未選択", "実行するフローを一覧から選択してください。")
-            return
-
-        idx = selection[0]
-        if idx >= len(self._flow_entries):
-            messagebox.showerror("エラー", "内部データと表示がずれています。")
-            return
-
-        entry = self._flow_entries[idx]
-        flow_path: Path = entry["file"]
-        flow_name: str = entry["name"]
-
-        if not flow_path.exists():
-            messagebox.showerror("ファイルなし", f"フローファイルが見つかりません: {flow_path}")
+        selected = self._get_selected_flow("実行する")
+        if selected is None:
             return
+        flow_path: Path = selected[1]["file"]
+        flow_name: str = selected[1]["name"]
 
         self.status_label.config(text=f"フロー実行中: {flow_name}")
         self._append_log(f"[RUN] {flow_name} ({flow_path.name})")
@@ -2706,31 +3469,24 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             self.flows_listbox.selection_set(index)
         self.flows_listbox.activate(index)
 
+        self._show_context_menu(self.flow_list_menu, event)
+
+    def _show_context_menu(self, menu: tk.Menu, event) -> None:
+        """右クリックメニューを表示する（メニュー本体は各タブの作成時に1回だけ作る）。"""
         try:
-            self.flow_list_menu.tk_popup(event.x_root, event.y_root)
+            menu.tk_popup(event.x_root, event.y_root)
         finally:
-            self.flow_list_menu.grab_release()
+            menu.grab_release()
 
     def _on_rename_flow(self) -> None:
         """選択中のフローの name とファイル名をまとめて変更する。"""
-        selection = self.flows_listbox.curselection()
-        if not selection:
-            messagebox.showinfo("フロー未選択", "名前を変更するフローを一覧から選択してください。")
-            return
-
-        idx = selection[0]
-        if idx >= len(self._flow_entries):
-            messagebox.showerror("エラー", "内部データと表示がずれています。")
+        selected = self._get_selected_flow("名前を変更する")
+        if selected is None:
             return
-
-        entry = self._flow_entries[idx]
+        idx, entry = selected
         old_name: str = entry["name"]
         old_path: Path = entry["file"]
 
-        if not old_path.exists():
-            messagebox.showerror("ファイルなし", f"フローファイルが見つかりません:\n{old_path}")
-            return
-
         # 新しいフロー名を聞く
         new_name = simpledialog.askstring(
             "フロー名の変更",
@@ -2748,10 +3504,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             return
 
         # フロー名からファイル名を生成
-        safe_name = "".join(c if c.isalnum() or c in "-_ " else "_" for c in new_name).strip()
-        safe_name = safe_name.replace(" ", "_")
-        if not safe_name:
-            safe_name = "flow"
+        safe_name = _flow_file_stem(new_name)
 
         new_path = FLOWS_DIR / f"{safe_name}.yaml"
 
@@ -2763,17 +3516,9 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             )
             return
 
-        # YAML を読み込んで name だけ差し替えつつ、新しいパスに保存
+        # name だけ差し替えつつ、新しいパスに保存
         try:
-            with old_path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            if not isinstance(data, dict):
-                data = {}
-
-            data["name"] = new_name
-
-            with new_path.open("w", encoding="utf-8") as f:
-                yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+            _write_flow_with_name(old_path, new_path, new_name)
 
             # パスが変わっているなら元ファイルを削除（実質 rename）
             if new_path != old_path and old_path.exists():
@@ -2783,30 +3528,24 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             messagebox.showerror("名前変更エラー", f"フロー名の変更に失敗しました。\n{exc}")
             return
 
-        # 一覧を再読み込み
-        self._load_flows_list()
+        # 一覧は変わった行だけ差し替える
+        self._remove_flow_row(idx)
+        new_idx = self._upsert_flow_row(new_path)
+        self.flows_listbox.selection_clear(0, tk.END)
+        self.flows_listbox.selection_set(new_idx)
+        self.flows_listbox.see(new_idx)
+        self._on_flow_selection_changed()
         self.status_label.config(text=f"フロー名を変更しました: {new_name}")
 
     def _on_duplicate_flow(self) -> None:
         """選択中のフローを複製して、新しいフローとして保存＆エディタで開く。"""
-        selection = self.flows_listbox.curselection()
-        if not selection:
-            messagebox.showinfo("フロー未選択", "複製するフローを一覧から選択してください。")
-            return
-
-        idx = selection[0]
-        if idx >= len(self._flow_entries):
-            messagebox.showerror("エラー", "内部データと表示がずれています。")
+        selected = self._get_selected_flow("複製する")
+        if selected is None:
             return
-
-        entry = self._flow_entries[idx]
+        idx, entry = selected
         old_name: str = entry["name"]
         old_path: Path = entry["file"]
 
-        if not old_path.exists():
-            messagebox.showerror("ファイルなし", f"フローファイルが見つかりません:\n{old_path}")
-            return
-
         # 新しいフロー名の候補（デフォルトは「〇〇（コピー）」）
         default_new_name = f"{old_name}（コピー）" if old_name else "新しいフロー"
 
@@ -2826,40 +3565,28 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             return
 
         # フロー名からベースとなるファイル名を生成
-        base_safe_name = "".join(c if c.isalnum() or c in "-_ " else "_" for c in new_name).strip()
-        base_safe_name = base_safe_name.replace(" ", "_")
-        if not base_safe_name:
-            base_safe_name = "flow"
+        base_safe_name = _flow_file_stem(new_name)
 
         # 同名ファイルがすでにある場合は _2, _3… とずらす
+        # （フォルダは1回だけ読み、空き番号は名前の集合で探す。Windows では大文字小文字を区別しない）
+        with os.scandir(FLOWS_DIR) as it:
+            existing = {os.path.normcase(e.name) for e in it}
         candidate = base_safe_name
         i = 2
-        while True:
-            candidate_path = FLOWS_DIR / f"{candidate}.yaml"
-            if not candidate_path.exists():
-                new_path = candidate_path
-                break
+        while os.path.normcase(f"{candidate}.yaml") in existing:
             candidate = f"{base_safe_name}_{i}"
             i += 1
+        new_path = FLOWS_DIR / f"{candidate}.yaml"
 
-        # 元の YAML を読み込んで、name だけ差し替えて新パスに保存
+        # 元の YAML の name だけ差し替えて新パスに保存
         try:
-            with old_path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            if not isinstance(data, dict):
-                data = {}
-
-            data["name"] = new_name
-
-            with new_path.open("w", encoding="utf-8") as f:
-                yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
-
+            _write_flow_with_name(old_path, new_path, new_name)
         except Exception as exc:
             messagebox.showerror("複製エラー", f"フローの複製に失敗しました。\n{exc}")
             return
 
-        # 一覧を更新
-        self._load_flows_list()
+        # 一覧に複製した行を追加
+        self._upsert_flow_row(new_path)
 
         # せっかくなので、複製したフローをエディタで即開く
         try:
@@ -2919,10 +3646,8 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             return
 
         # 複数選択対応
-        entries_to_delete = []
-        for idx in selection:
-            if idx < len(self._flow_entries):
-                entries_to_delete.append(self._flow_entries[idx])
+        indexes = [idx for idx in selection if idx < len(self._flow_entries)]
+        entries_to_delete = [self._ensure_flow_parsed(idx) for idx in indexes]
 
         if not entries_to_delete:
             messagebox.showerror("エラー", "内部データと表示がずれています。")
@@ -2944,16 +3669,22 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         # 削除実行
         deleted_count = 0
-        for entry in entries_to_delete:
+        deleted_indexes: List[int] = []
+        try:
+            TRASH_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            self._append_log(f"[ERROR] ゴミ箱フォルダを作成できませんでした: {exc}")
+            return
+        for idx, entry in zip(indexes, entries_to_delete):
             flow_name = entry["name"]
             flow_path: Path = entry["file"]
 
             if not flow_path.exists():
+                # もう無いファイルは一覧からも消す
+                deleted_indexes.append(idx)
                 continue
 
             try:
-                TRASH_DIR.mkdir(parents=True, exist_ok=True)
-
                 target = TRASH_DIR / flow_path.name
                 if target.exists():
                     stem = flow_path.stem
@@ -2961,14 +3692,27 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                     target = TRASH_DIR / f"{stem}_{ts}{suffix}"
 
-                shutil.move(str(flow_path), str(target))
+                # 同じドライブなら rename 1回で済む。別ドライブのときだけコピー＋削除
+                try:
+                    os.replace(flow_path, target)
+                except OSError:
+                    shutil.move(flow_path, target)
+                deleted_indexes.append(idx)
                 deleted_count += 1
                 self._append_log(f"[DELETE] フロー '{flow_name}' をゴミ箱に移動しました。 ({flow_path.name})")
             except OSError as exc:
                 self._append_log(f"[ERROR] フロー '{flow_name}' の削除に失敗: {exc}")
 
         self.status_label.config(text=f"{deleted_count} 件のフローを削除しました。（ゴミ箱に移動）")
-        self._load_flows_list()
+
+        # 一覧からは消した行だけ取り除き、その位置の行を選び直す
+        if deleted_indexes:
+            for idx in sorted(deleted_indexes, reverse=True):
+                self._remove_flow_row(idx)
+            self.flows_listbox.selection_clear(0, tk.END)
+            if self._flow_entries:
+                self.flows_listbox.selection_set(min(min(deleted_indexes), len(self._flow_entries) - 1))
+            self._on_flow_selection_changed()
 
     def _open_trash_manager(self) -> None:
         if not TRASH_DIR.exists():
@@ -2990,7 +3734,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         zip_path = Path(path)
         try:
-            FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+            self._ensure_flows_dir()
 
             with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
                 # flows/*.yaml （.trash は除外）
@@ -3022,7 +3766,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             return
 
         try:
-            FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+            self._ensure_flows_dir()
 
             imported_flows = 0
 
@@ -3102,22 +3846,56 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
     def _refresh_site_list(self) -> None:
         self.site_listbox.delete(0, tk.END)
-        sites = self.resources.get("sites", {})
-        for key, site in sites.items():
-            label = site.get("label") or key
-            # 画面には表示名だけ出す
-            self.site_listbox.insert(tk.END, label)
+        sites = self._sites_bucket
+        # 行番号 -> キー（選択時に使う）
+        self._site_keys = list(sites)
+        # 画面には表示名だけ出す
+        labels = [sites[key].get("label") or key for key in self._site_keys]
+        if labels:
+            self.site_listbox.insert(tk.END, *labels)
+
+    def _update_resource_row(self, kind: str, key: str) -> None:
+        """sites / files の key の行だけをリソースタブの一覧に反映する（一覧全体は作り直さない）。
+
+        追加なら末尾に足し、削除なら行を消し、表示名が変わっていれば行を差し替える。
+        """
+        if kind == "sites":
+            listbox, keys, bucket = self.site_listbox, self._site_keys, self._sites_bucket
+        else:
+            listbox, keys, bucket = self.file_listbox, self._file_keys, self._files_bucket
+
+        item = bucket.get(key)
+        if key not in keys:
+            if item is not None:
+                keys.append(key)
+                listbox.insert(tk.END, item.get("label") or key)
+            return
+
+        idx = keys.index(key)
+        if item is None:
+            del keys[idx]
+            listbox.delete(idx)
+            return
+
+        label = item.get("label") or key
+        if listbox.get(idx) != label:
+            selected = listbox.selection_includes(idx)
+            listbox.delete(idx)
+            listbox.insert(idx, label)
+            if selected:
+                listbox.selection_set(idx)
 
     def _on_site_selected(self, event) -> None:
         selection = self.site_listbox.curselection()
         if not selection:
             return
         idx = selection[0]
-        sites = self.resources.get("sites", {})
-        if idx >= len(sites):
+        if idx >= len(self._site_keys):
+            return
+        key = self._site_keys[idx]
+        site = self._sites_bucket.get(key)
+        if site is None:
             return
-        key = list(sites.keys())[idx]
-        site = sites[key]
         # キーは裏で保持、画面には出さない
         self.site_key_var.set(key)
         self.site_label_var.set(site.get("label", ""))
@@ -3136,7 +3914,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             messagebox.showwarning("入力不足", "表示名とURLは必須です。")
             return
 
-        sites = self.resources.setdefault("sites", {})
+        sites = self._sites_bucket
 
         key = self.site_key_var.get().strip()
         if not key:
@@ -3146,25 +3924,15 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         sites[key] = {"label": label, "url": url}
         self.site_key_var.set(key)  # 裏で保持
         self._save_resources()
-        self._refresh_site_list()
+        self._update_resource_row("sites", key)
         self.status_label.config(text=f"サイトリソースを保存しました: {label}")
 
     def _on_site_url_changed(self, *args) -> None:
         """URL欄が変更されたときに呼ばれる（即取得せず、少し待ってから実行）。"""
-        # すでにスケジュールがあればキャンセル
-        if getattr(self, "_site_title_after_id", None) is not None:
-            try:
-                self.after_cancel(self._site_title_after_id)
-            except Exception:
-                pass
-            self._site_title_after_id = None
-
-        # 0.8秒後に実行（タイプ中に連打しないように）
-        self._site_title_after_id = self.after(800, self._auto_fill_site_title_from_url)
+        # 最後の入力から0.8秒後に実行（タイプ中に連打しないように）
+        self._debounce("site_title", 800, self._auto_fill_site_title_from_url)
 
     def _auto_fill_site_title_from_url(self) -> None:
-        self._site_title_after_id = None
-
         url = self.site_url_var.get().strip()
         if not url:
             return
@@ -3177,7 +3945,12 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         if "://" not in url and "." not in url:
             return
 
-        title = self._fetch_title_from_url(url)
+        self._fetch_title_async(url, lambda title: self._apply_auto_site_title(url, title))
+
+    def _apply_auto_site_title(self, url: str, title: Optional[str]) -> None:
+        # 取得している間に URL / 表示名が変わっていたら反映しない
+        if self.site_url_var.get().strip() != url or self.site_label_var.get().strip():
+            return
 
         if title:
             # 正常にタイトル取れたケース
@@ -3193,6 +3966,40 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                 text="ページタイトルは取得できなかったため、URLから簡易な表示名を設定しました"
             )
 
+    def _debounce(self, key: str, delay_ms: int, callback: Callable[[], None]) -> None:
+        """最後に呼ばれてから delay_ms 経ったところで callback を1回だけ呼ぶ。
+
+        入力のたびに after を取り消して張り直すのではなく、締め切りだけを延ばしておき、
+        タイマーが来た時点でまだ締め切り前なら残り時間で張り直す（タイマーは常に1つ）。
+        """
+        pending = key in self._debounce_deadlines
+        self._debounce_deadlines[key] = time.monotonic() + delay_ms / 1000
+        if not pending:
+            self.after(delay_ms, self._debounce_fire, key, callback)
+
+    def _debounce_fire(self, key: str, callback: Callable[[], None]) -> None:
+        remaining_ms = int((self._debounce_deadlines[key] - time.monotonic()) * 1000)
+        if remaining_ms > 0:
+            self.after(remaining_ms, self._debounce_fire, key, callback)
+            return
+        del self._debounce_deadlines[key]
+        callback()
+
+    def _fetch_title_async(self, url: str, on_done: Callable[[Optional[str]], None]) -> None:
+        """タイトル取得をワーカースレッドで行い、終わったら Tk のスレッドで on_done(title) を呼ぶ。"""
+        future = self._net_pool.submit(self._fetch_title_from_url, url)
+        self.after(100, self._check_future, future, on_done)
+
+    def _check_future(self, future: Future, on_done: Callable[[Any], None]) -> None:
+        if not future.done():
+            self.after(100, self._check_future, future, on_done)
+            return
+        try:
+            result = future.result()
+        except Exception:
+            result = None
+        on_done(result)
+
     def _fetch_title_from_url(self, url: str) -> str | None:
         """URL から <title> を引っこ抜いて返す。失敗したら None。"""
         if not url:
@@ -3205,37 +4012,12 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             url = "https://" + url
 
         try:
-            # ブラウザっぽい User-Agent を名乗る
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/122.0 Safari/537.36"
-                    )
-                },
-            )
-            with urllib.request.urlopen(req, timeout=5) as resp:
-                charset = resp.headers.get_content_charset() or "utf-8"
-                data = resp.read()
+            return _fetch_title_cached(url)
+        except LookupError:
+            return None
         except Exception as e:
             print(f"[RPA] タイトル取得失敗: {e}")
             return None
-
-        try:
-            text = data.decode(charset, errors="ignore")
-        except Exception:
-            text = data.decode("utf-8", errors="ignore")
-
-        m = re.search(r"<title[^>]*>(.*?)</title>", text, re.IGNORECASE | re.DOTALL)
-        if not m:
-            return None
-
-        title = m.group(1)
-        title = re.sub(r"\s+", " ", title).strip()
-        title = html_lib.unescape(title)
-        return title or None
     
     def _guess_label_from_url(self, url: str) -> str:
         """タイトルが取れなかったとき用に、URLからそれっぽい表示名を作る。"""
@@ -3252,15 +4034,14 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         # ホスト部分からベースの名前を作る
         if host:
-            parts = host.split(".")
             # outlook.office.com → outlook
-            base = parts[0].capitalize()
+            base = host.partition(".")[0].capitalize()
         else:
             base = url
 
         if path:
             # /mail/ → Mail
-            first = path.split("/")[0]
+            first = path.partition("/")[0]
             base = f"{base} {first.capitalize()}"
 
         return base
@@ -3288,9 +4069,14 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             return
 
         self.status_label.config(text="URL からタイトルを取得しています...")
-        self.update_idletasks()
+        self._fetch_title_async(url, lambda title: self._apply_fetched_site_title(url, title))
+
+    def _apply_fetched_site_title(self, url: str, title: Optional[str]) -> None:
+        if self.site_url_var.get().strip() != url:
+            # 取得している間に URL が変わった
+            self.status_label.config(text="URL が変更されたため、取得したタイトルは使いませんでした")
+            return
 
-        title = self._fetch_title_from_url(url)
         if not title:
             messagebox.showinfo(
                 "取得できませんでした",
@@ -3320,7 +4106,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         if not key:
             messagebox.showwarning("選択なし", "削除するサイトを一覧から選択してください。")
             return
-        sites = self.resources.get("sites", {})
+        sites = self._sites_bucket
         if key not in sites:
             messagebox.showwarning("存在しません", "選択されたサイトは登録されていません。")
             return
@@ -3331,28 +4117,31 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         del sites[key]
         self._save_resources()
-        self._refresh_site_list()
+        self._update_resource_row("sites", key)
         self._on_site_new()
         self.status_label.config(text=f"サイトリソースを削除しました: {label}")
 
     def _refresh_file_list(self) -> None:
         self.file_listbox.delete(0, tk.END)
-        files = self.resources.get("files", {})
-        for key, item in files.items():
-            label = item.get("label") or key
-            # 画面には表示名だけ
-            self.file_listbox.insert(tk.END, label)
+        files = self._files_bucket
+        # 行番号 -> キー（選択時に使う）
+        self._file_keys = list(files)
+        # 画面には表示名だけ
+        labels = [files[key].get("label") or key for key in self._file_keys]
+        if labels:
+            self.file_listbox.insert(tk.END, *labels)
 
     def _on_file_selected(self, event) -> None:
         selection = self.file_listbox.curselection()
         if not selection:
             return
         idx = selection[0]
-        files = self.resources.get("files", {})
-        if idx >= len(files):
+        if idx >= len(self._file_keys):
+            return
+        key = self._file_keys[idx]
+        item = self._files_bucket.get(key)
+        if item is None:
             return
-        key = list(files.keys())[idx]
-        item = files[key]
         self.file_key_var.set(key)
         self.file_label_var.set(item.get("label", ""))
         self.file_path_var.set(item.get("path", ""))
@@ -3383,7 +4172,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                 )
                 return
 
-        files = self.resources.setdefault("files", {})
+        files = self._files_bucket
 
         key = self.file_key_var.get().strip()
         if not key:
@@ -3392,7 +4181,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         files[key] = {"label": label, "path": path}
         self.file_key_var.set(key)
         self._save_resources()
-        self._refresh_file_list()
+        self._update_resource_row("files", key)
         self.status_label.config(text=f"ファイルリソースを保存しました: {label}")
 
     def _on_file_delete(self) -> None:
@@ -3400,7 +4189,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         if not key:
             messagebox.showwarning("選択なし", "削除するファイルを一覧から選択してください。")
             return
-        files = self.resources.get("files", {})
+        files = self._files_bucket
         if key not in files:
             messagebox.showwarning("存在しません", "選択されたファイルは登録されていません。")
             return
@@ -3411,26 +4200,17 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         del files[key]
         self._save_resources()
-        self._refresh_file_list()
+        self._update_resource_row("files", key)
         self._on_file_new()
         self.status_label.config(text=f"ファイルリソースを削除しました: {label}")
 
     def _on_file_path_changed(self, *args) -> None:
         """ファイルパス欄が変更されたときに呼ばれる（少し待ってから実行）。"""
-        if getattr(self, "_file_title_after_id", None) is not None:
-            try:
-                self.after_cancel(self._file_title_after_id)
-            except Exception:
-                pass
-            self._file_title_after_id = None
-
-        # 0.5秒後に実行（タイプ中に連打しないように）
-        self._file_title_after_id = self.after(500, self._auto_fill_file_label_from_path)
+        # 最後の入力から0.5秒後に実行（タイプ中に連打しないように）
+        self._debounce("file_label", 500, self._auto_fill_file_label_from_path)
 
     def _auto_fill_file_label_from_path(self) -> None:
         """ファイルパスから表示名を自動セットする（表示名が空のときだけ）。"""
-        self._file_title_after_id = None
-
         path = self.file_path_var.get().strip()
         if not path:
             return
@@ -3451,14 +4231,32 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         if path:
             self.file_path_var.set(path)
 
+    def _open_step_editor(self, initial_step: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """ステップ編集ダイアログを出して結果を返す（キャンセル時は None）。
+
+        ダイアログは1つだけ作って隠しておき、2回目以降は reset して使い回す。
+        ダークモードが切り替わっていたら配色ごと作り直す。
+        """
+        dialog = self._step_editor
+        if dialog is not None and (not dialog.winfo_exists() or dialog._dark_mode != self._dark_mode):
+            dialog.destroy()
+            dialog = None
+        if dialog is None:
+            dialog = StepEditor(
+                self, _BUILTIN_ACTION_IDS, initial_step=initial_step,
+                resources=self.resources, dark_mode=self._dark_mode,
+            )
+            self._step_editor = dialog
+        else:
+            dialog.reset(initial_step, self.resources)
+        return dialog.show_modal()
+
     def _editor_add_step(self) -> None:
-        actions = list(BUILTIN_ACTIONS.keys())
-        dialog = StepEditor(self, actions, resources=self.resources, dark_mode=self._dark_mode)
-        self.wait_window(dialog)
-        result = dialog.get_result()
+        result = self._open_step_editor()
         if result is None:
             return
         self.edit_steps.append(result)
+        self._mark_editor_edited()
         self._refresh_edit_steps_list()
 
     def _editor_edit_step(self) -> None:
@@ -3471,17 +4269,16 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         idx = sel[0]
         if idx < 0 or idx >= len(self.edit_steps):
             return
-        current = self.edit_steps[idx]
-        actions = list(BUILTIN_ACTIONS.keys())
-        dialog = StepEditor(self, actions, initial_step=current, resources=self.resources, dark_mode=self._dark_mode)
-        self.wait_window(dialog)
-        result = dialog.get_result()
+        result = self._open_step_editor(self.edit_steps[idx])
         if result is None:
             return
         self.edit_steps[idx] = result
+        self._mark_editor_edited()
         self._refresh_edit_steps_list()
 
     def _editor_delete_step(self) -> None:
+        if not self.edit_steps_list:
+            return
         sel = self.edit_steps_list.curselection()
         if not sel:
             return
@@ -3489,10 +4286,13 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         if idx < 0 or idx >= len(self.edit_steps):
             return
         del self.edit_steps[idx]
+        self._mark_editor_edited()
         self._refresh_edit_steps_list()
 
     def _editor_duplicate_step(self) -> None:
         """選択中のステップを複製して直下に挿入する。"""
+        if not self.edit_steps_list:
+            return
         sel = self.edit_steps_list.curselection()
         if not sel:
             messagebox.showinfo("ステップ未選択", "複製するステップを選択してください。")
@@ -3507,12 +4307,15 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         
         # 複製したステップを直下に挿入
         self.edit_steps.insert(idx + 1, duplicated)
+        self._mark_editor_edited()
         self._refresh_edit_steps_list()
         
         # 複製したステップを選択状態にする
         self.edit_steps_list.selection_set(idx + 1)
 
     def _editor_move_step(self, direction: int) -> None:
+        if not self.edit_steps_list:
+            return
         sel = self.edit_steps_list.curselection()
         if not sel:
             return
@@ -3521,16 +4324,60 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         if new_idx < 0 or new_idx >= len(self.edit_steps):
             return
         self.edit_steps[idx], self.edit_steps[new_idx] = self.edit_steps[new_idx], self.edit_steps[idx]
-        self._refresh_edit_steps_list()
-        self.edit_steps_list.selection_set(new_idx)
+        self._mark_editor_edited()
+        # 入れ替わった 2 行以外は番号も中身も変わらないので、その 2 行だけ差し替える
+        self.edit_steps_list.update_items(
+            {i: f"{i + 1}. {self._cached_step_text(self.edit_steps[i])}" for i in (idx, new_idx)},
+            select=new_idx,
+        )
+
+    def _mark_editor_edited(self, *_args: Any) -> None:
+        """エディタの内容が手で変わったことを記録する（読み込み中の結果は反映しない）。
+
+        ステップ一覧の操作から呼ぶほか、フロー名・説明・エラー方針の trace_add からも呼ばれる。
+        """
+        self._editor_load_gen += 1
+        loading = self._editor_loading_path
+        if loading is not None:
+            self._editor_loading_path = None
+            self.status_label.config(text=f"編集されたため、{loading.name} の読み込みを取り消しました")
 
     def _editor_load_from_path(self, path: Path) -> None:
-        """指定された YAML フローを読み込み、フローエディタに反映する。"""
+        """指定された YAML フローを読み込み、フローエディタに反映する。
+
+        読み込み（YAML の解析）はワーカースレッドで行い、終わったら
+        _on_editor_flow_loaded がメインスレッドで呼ばれる（保存と同じ流れ）。
+        """
+        # 続けて別のフローを開いたり、読み込み中にエディタを編集したら、先に始めた読み込みの結果は捨てる
+        self._editor_load_gen += 1
+        self._editor_loading_path = path
+        self.status_label.config(text=f"フローを読み込み中...: {path.name}")
+        threading.Thread(
+            target=self._read_flow_for_edit,
+            args=(path, self._editor_load_gen),
+            name="avantixrpa-load",
+            daemon=True,
+        ).start()
+
+    def _read_flow_for_edit(self, path: Path, gen: int) -> None:
+        """（ワーカースレッド）フロー YAML を読み、結果をメインスレッドに返す。Tk には触らない。"""
+        data: Any = None
+        error: Optional[Exception] = None
         try:
             with path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=_YamlLoader) or {}
         except Exception as exc:
-            messagebox.showerror("読み込み失敗", f"フローの読み込みに失敗しました。\n{exc}")
+            error = exc
+        self.after(0, self._on_editor_flow_loaded, path, gen, data, error)
+
+    def _on_editor_flow_loaded(self, path: Path, gen: int, data: Any, error: Optional[Exception]) -> None:
+        """フロー読み込み完了後にエディタへ反映する（メインスレッドで実行される）。"""
+        if gen != self._editor_load_gen:
+            return
+        self._editor_loading_path = None
+        if error is not None:
+            self.status_label.config(text="フローの読み込みに失敗しました")
+            messagebox.showerror("読み込み失敗", f"フローの読み込みに失敗しました。\n{error}")
             return
 
         if not isinstance(data, dict):
@@ -3560,105 +4407,129 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
         self.status_label.config(text=f"フローを読み込みました: {path.name}")
 
+    def _format_edit_step(self, step: Dict[str, Any]) -> str:
+        """1ステップ分の表示文字列（「N. 」の番号を除いた部分）を作る。"""
+        sites = self._sites_bucket
+        files = self._files_bucket
+
+        action = step.get("action", "?")
+        params = step.get("params") or {}
+        on_error = step.get("on_error")
+
+        base_label = self._action_id_to_label.get(action, action)
+
+        # ざっくり内容の要約を作る
+        summary = ""
+
+        if action == "print":
+            msg = str(params.get("message", "")).strip()
+            if msg:
+                short = msg[:30]
+                if len(msg) > 30:
+                    short += "…"
+                summary = f"「{short}」"
+
+        elif action == "wait":
+            sec = params.get("seconds")
+            if sec is not None:
+                summary = f"{sec} 秒待つ"
+
+        elif action == "browser.open":
+            url = str(params.get("url", "")).strip()
+            if url:
+                summary = url
+
+        elif action == "resource.open_site":
+            key = params.get("key")
+            item = sites.get(key, {}) if key else {}
+            label = item.get("label") or str(key or "")
+            if label:
+                summary = f"{label}（サイト）"
+
+        elif action == "resource.open_file":
+            key = params.get("key")
+            item = files.get(key, {}) if key else {}
+            label = item.get("label") or str(key or "")
+            if label:
+                summary = f"{label}（ファイル）"
+
+        elif action == "run.program":
+            prog = str(params.get("program", "")).strip()
+            if prog:
+                summary = prog
+
+        elif action == "ui.type":
+            txt = str(params.get("text", "")).strip()
+            if txt:
+                short = txt[:20]
+                if len(txt) > 20:
+                    short += "…"
+                summary = f"「{short}」を入力"
+
+        elif action == "ui.hotkey":
+            keys = params.get("keys") or []
+            if isinstance(keys, list) and keys:
+                summary = "+".join(keys)
+
+        elif action in ("ui.move", "ui.click", "ui.scroll"):
+            x = params.get("x")
+            y = params.get("y")
+            pos = ""
+            if x is not None and y is not None:
+                pos = f"({x}, {y})"
+            if action == "ui.scroll":
+                amount = params.get("amount")
+                if amount is not None:
+                    summary = f"{pos} amount={amount}" if pos else f"amount={amount}"
+            else:
+                if pos:
+                    summary = pos
+
+        elif action in ("file.copy", "file.move"):
+            src = params.get("src")
+            dst = params.get("dst")
+            if src and dst:
+                summary = f"{src} → {dst}"
+
+        # 最終的な表示文字列を組み立てる（先頭の番号は呼び出し側で付ける）
+        text = base_label
+        if summary:
+            text += f" - {summary}"
+        if on_error:
+            text += f"  [エラー時: {on_error}]"
+        return text
+
+    def _cached_step_text(self, step: Dict[str, Any]) -> str:
+        """_format_edit_step の結果をキャッシュ経由で返す。"""
+        hit = self._step_label_cache.get(id(step))
+        if hit is not None and hit[0] is step:
+            return hit[1]
+        text = self._format_edit_step(step)
+        self._step_label_cache[id(step)] = (step, text)
+        return text
+
     def _refresh_edit_steps_list(self) -> None:
         """ステップ一覧の表示を、人間が読める日本語ベースに整える。"""
-        self.edit_steps_list.delete(0, tk.END)
-
-        sites = (self.resources or {}).get("sites", {})
-        files = (self.resources or {}).get("files", {})
+        if not self.edit_steps_list:
+            # タブ未作成。作成時に self.edit_steps から描画される
+            return
 
+        cache = self._step_label_cache
+        fresh: Dict[int, tuple[Dict[str, Any], str]] = {}
+        labels: List[str] = []
         for i, step in enumerate(self.edit_steps, start=1):
-            action = step.get("action", "?")
-            params = step.get("params") or {}
-            on_error = step.get("on_error")
-
-            base_label = self._action_id_to_label.get(action, action)
-
-            # ざっくり内容の要約を作る
-            summary = ""
-
-            if action == "print":
-                msg = str(params.get("message", "")).strip()
-                if msg:
-                    short = msg[:30]
-                    if len(msg) > 30:
-                        short += "…"
-                    summary = f"「{short}」"
-
-            elif action == "wait":
-                sec = params.get("seconds")
-                if sec is not None:
-                    summary = f"{sec} 秒待つ"
-
-            elif action == "browser.open":
-                url = str(params.get("url", "")).strip()
-                if url:
-                    summary = url
-
-            elif action == "resource.open_site":
-                key = params.get("key")
-                item = sites.get(key, {}) if key else {}
-                label = item.get("label") or str(key or "")
-                if label:
-                    summary = f"{label}（サイト）"
-
-            elif action == "resource.open_file":
-                key = params.get("key")
-                item = files.get(key, {}) if key else {}
-                label = item.get("label") or str(key or "")
-                if label:
-                    summary = f"{label}（ファイル）"
-
-            elif action == "run.program":
-                prog = str(params.get("program", "")).strip()
-                if prog:
-                    summary = prog
-
-            elif action == "ui.type":
-                txt = str(params.get("text", "")).strip()
-                if txt:
-                    short = txt[:20]
-                    if len(txt) > 20:
-                        short += "…"
-                    summary = f"「{short}」を入力"
-
-            elif action == "ui.hotkey":
-                keys = params.get("keys") or []
-                if isinstance(keys, list) and keys:
-                    summary = "+".join(keys)
-
-            elif action in ("ui.move", "ui.click", "ui.scroll"):
-                x = params.get("x")
-                y = params.get("y")
-                pos = ""
-                if x is not None and y is not None:
-                    pos = f"({x}, {y})"
-                if action == "ui.scroll":
-                    amount = params.get("amount")
-                    if amount is not None:
-                        summary = f"{pos} amount={amount}" if pos else f"amount={amount}"
-                else:
-                    if pos:
-                        summary = pos
-
-            elif action in ("file.copy", "file.move"):
-                src = params.get("src")
-                dst = params.get("dst")
-                if src and dst:
-                    summary = f"{src} → {dst}"
-
-            # 最終的な表示文字列を組み立てる
-            text = f"{i}. {base_label}"
-            if summary:
-                text += f" - {summary}"
-            if on_error:
-                text += f"  [エラー時: {on_error}]"
-
-            self.edit_steps_list.insert(tk.END, text)
+            hit = cache.get(id(step))
+            text = hit[1] if hit is not None and hit[0] is step else self._format_edit_step(step)
+            fresh[id(step)] = (step, text)
+            labels.append(f"{i}. {text}")
+        # 今の edit_steps に無いステップの分はここで捨てる
+        self._step_label_cache = fresh
 
         # ★ ステップが空の時はプレースホルダーを表示
-        if not self.edit_steps:
-            self.edit_steps_list.insert(tk.END, "（ステップがありません。「ステップを追加」で追加してください）")
+        if not labels:
+            labels.append("（ステップがありません。「ステップを追加」で追加してください）")
+        # まとめて1回で差し替える（DraggableStepList は変更のたびに全体を描き直すため）
+        self.edit_steps_list.set_items(labels)
 
     def _editor_new_flow(self) -> None:
         """フローエディタをリセットして、新規作成モードにする。"""
@@ -3712,12 +4583,10 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         scroll.grid(row=1, column=1, sticky="ns", pady=(0, 4))
         lb.config(yscrollcommand=scroll.set)
 
-        # 表示は「フロー名だけ」 or 「[無効] フロー名」
-        for entry in self._flow_entries:
-            name = entry.get("name", "")
-            enabled = entry.get("enabled", True)
-            label = name if enabled else f"[無効] {name}"
-            lb.insert(tk.END, label)
+        # 表示は「フロー名だけ」 or 「[無効] フロー名」（全件見せるのでここで全部読み込む）
+        labels = [self._flow_list_label(self._ensure_flow_parsed(idx)) for idx in range(len(self._flow_entries))]
+        if labels:
+            lb.insert(tk.END, *labels)
 
         # すでに何か編集中なら、そのフローを初期選択にする
         if self.current_edit_flow_path is not None:
@@ -3762,54 +4631,25 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
 
     def _editor_load_flow(self) -> None:
         """既存フロー一覧から1つ選んで、エディタに読み込む。"""
-        FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+        self._ensure_flows_dir()
 
         path = self._choose_flow_for_edit()
         if path is None:
             return
 
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-        except Exception as exc:
-            messagebox.showerror("読み込み失敗", f"フローの読み込みに失敗しました。\n{exc}")
-            return
-
-        if not isinstance(data, dict):
-            messagebox.showerror("形式エラー", "フローファイルの形式が不正です。")
-            return
-
-        name = data.get("name") or ""
-        on_error = data.get("on_error") or "stop"
-        description = data.get("description") or ""
-        steps_raw = data.get("steps") or []
-
-        self.edit_flow_name_var.set(name)
-        self.edit_on_error_var.set(on_error)
-        self.edit_flow_description_var.set(description)
-
-        self.edit_steps = []
-        for step in steps_raw:
-            if not isinstance(step, dict):
-                continue
-            action = step.get("action")
-            params = step.get("params") or {}
-            on_err = step.get("on_error")
-
-            step_data: Dict[str, Any] = {
-                "action": action,
-                "params": params,
-            }
-            if on_err is not None:
-                step_data["on_error"] = on_err
+        # 読み込みと検証はフロー一覧からの「編集」と共通
+        self._editor_load_from_path(path)
 
-            self.edit_steps.append(step_data)
+    def _editor_save_flow(self, on_saved: Optional[Callable[[Path], None]] = None) -> None:
+        """エディタの内容を YAML に保存する。
 
-        self.current_edit_flow_path = path
-        self._refresh_edit_steps_list()
-        self.status_label.config(text=f"フローを読み込みました: {path.name}")
+        書き込みはワーカースレッドで行い、完了したら _on_save_complete が
+        メインスレッドで呼ばれる。on_saved は保存に成功したときだけ呼ばれる。
+        """
+        if self._save_in_flight:
+            self.status_label.config(text="保存中です。完了をお待ちください。")
+            return
 
-    def _editor_save_flow(self) -> None:
         name = self.edit_flow_name_var.get().strip()
         if not name:
             messagebox.showwarning("フロー名不足", "フロー名（RPA名）を入力してください。")
@@ -3824,12 +4664,14 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
         data = {
             "name": name,
             "on_error": on_error,
-            "steps": self.edit_steps,
+            # 保存中に一覧を並べ替えられても影響しないようにリストだけ複製する
+            # （ステップの dict は編集時に丸ごと差し替えられるので共有してよい）
+            "steps": list(self.edit_steps),
         }
         if description:
             data["description"] = description
 
-        FLOWS_DIR.mkdir(parents=True, exist_ok=True)
+        self._ensure_flows_dir()
 
         # ★ 新規作成か、既存フローの上書きかを判定
         if self.current_edit_flow_path is not None:
@@ -3837,10 +4679,7 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             path = self.current_edit_flow_path
         else:
             # 新規フロー → フロー名からファイル名を生成
-            safe_name = "".join(c if c.isalnum() or c in "-_ " else "_" for c in name).strip()
-            safe_name = safe_name.replace(" ", "_")
-            if not safe_name:
-                safe_name = "flow"
+            safe_name = _flow_file_stem(name)
 
             path = FLOWS_DIR / f"{safe_name}.yaml"
 
@@ -3851,19 +4690,58 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
                 ):
                     return
 
+        self._save_in_flight = True
+        self.status_label.config(text="保存中...")
+        threading.Thread(
+            target=self._serialize_and_write,
+            args=(path, data, self.current_edit_flow_path, on_saved),
+            name="avantixrpa-save",
+            daemon=True,
+        ).start()
+
+    def _serialize_and_write(
+        self,
+        path: Path,
+        data: Dict[str, Any],
+        prev_path: Optional[Path],
+        on_saved: Optional[Callable[[Path], None]],
+    ) -> None:
+        """（ワーカースレッド）フローを YAML にして書き込み、結果をメインスレッドに返す。"""
+        error: Optional[Exception] = None
         try:
-            with path.open("w", encoding="utf-8") as f:
-                yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+            # 文字列にしてから 1 回で書く（直接ストリームに書くと細かい write が大量に出る。
+            # シリアライズに失敗しても既存ファイルを途中まで上書きしてしまわない）
+            text = yaml.dump(data, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False)
+            path.write_text(text, encoding="utf-8")
         except Exception as exc:
-            messagebox.showerror("保存エラー", f"フローの保存に失敗しました。\n{exc}")
+            error = exc
+        self.after(0, self._on_save_complete, path, error, prev_path, on_saved)
+
+    def _on_save_complete(
+        self,
+        path: Path,
+        error: Optional[Exception],
+        prev_path: Optional[Path],
+        on_saved: Optional[Callable[[Path], None]],
+    ) -> None:
+        """フロー保存完了後のUI更新（メインスレッドで実行される）。"""
+        self._save_in_flight = False
+        if error is not None:
+            self.status_label.config(text="フローの保存に失敗しました")
+            messagebox.showerror("保存エラー", f"フローの保存に失敗しました。\n{error}")
             return
 
         # 新規保存だった場合も、以後はこのファイルを「編集中」とみなす
-        self.current_edit_flow_path = path
+        # （保存中に別のフローを開いていたら、そちらの編集状態は変えない）
+        if self.current_edit_flow_path == prev_path:
+            self.current_edit_flow_path = path
 
         messagebox.showinfo("保存完了", f"フローを保存しました。\n{path}")
         self.status_label.config(text=f"フローを保存しました: {path.name}")
-        self._load_flows_list()
+        self._upsert_flow_row(path)
+        self._on_flow_selection_changed()
+        if on_saved is not None:
+            on_saved(path)
 
     def _editor_run_flow(self) -> None:
         """フローエディタで開いているフローを保存してから実行する。"""
@@ -3872,6 +4750,8 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             messagebox.showinfo("実行中", "現在フロー実行中です。完了をお待ちください。")
             return
 
+        flow_name = self.edit_flow_name_var.get().strip()
+
         # まず保存されているかチェック
         if self.current_edit_flow_path is None:
             # まだ一度も保存していないフロー
@@ -3882,20 +4762,26 @@ class MainWindow(TkinterDnD.Tk if DND_AVAILABLE else tk.Tk):
             ):
                 return
 
-            # 保存実行（失敗したりユーザーがキャンセルしたら current_edit_flow_path は None のまま）
-            self._editor_save_flow()
-            if self.current_edit_flow_path is None:
-                # 保存失敗 or キャンセル
-                return
+            # 保存はバックグラウンドで行うので、成功したら保存したファイルを実行する
+            # （保存中にエディタで別のフローを開いても、実行するのは保存したほう。
+            #   失敗したりユーザーがキャンセルしたら on_saved は呼ばれない）
+            self._editor_save_flow(on_saved=lambda path: self._editor_launch_flow(path, flow_name))
+            return
 
-        flow_path = self.current_edit_flow_path
-        assert flow_path is not None  # 型的なおまじない
+        self._editor_launch_flow(self.current_edit_flow_path, flow_name)
+
+    def _editor_launch_flow(self, flow_path: Path, flow_name: str) -> None:
+        """flow_path のフローを実行スレッドで起動する（flow_name が空ならファイル名で表示）。"""
+        # 保存を待っている間に別のフローの実行が始まっていることもある
+        if self._running_thread and self._running_thread.is_alive():
+            messagebox.showinfo("実行中", "現在フロー実行中です。完了をお待ちください。")
+            return
 
         if not flow_path.exists():
             messagebox.showerror("ファイルなし", f"フローファイルが見つかりません: {flow_path}")
             return
 
-        flow_name = self.edit_flow_name_var.get().strip() or flow_path.stem
+        flow_name = flow_name or flow_path.stem
 
         # ステータス＆ログ出力
         self.status_label.config(text=f"フロー実行中: {flow_name}")
@@ -3965,6 +4851,8 @@ class TrashManager(tk.Toplevel):
         self.configure(bg=self._bg)
 
         self._files: list[Path] = []
+        # フロー名の読み込み（_resolve_trash_names）の after ID
+        self._resolve_after_id: Optional[str] = None
 
         self._create_widgets()
         self._load_trash_list()
@@ -3985,7 +4873,12 @@ class TrashManager(tk.Toplevel):
         frame.columnconfigure(0, weight=1)
         frame.rowconfigure(0, weight=1)
 
-        self.listbox = tk.Listbox(frame, height=12, width=60, bg=self._panel_bg, fg=self._fg, selectbackground="#0078d7")
+        # 中身は listvariable 経由でまとめて差し替える（_load_trash_list）
+        self._trash_listvar = tk.StringVar(self)
+        self.listbox = tk.Listbox(
+            frame, height=12, width=60, bg=self._panel_bg, fg=self._fg, selectbackground="#0078d7",
+            listvariable=self._trash_listvar,
+        )
         self.listbox.grid(row=0, column=0, sticky="nsew")
 
         scroll = ttk.Scrollbar(frame, orient="vertical", command=self.listbox.yview)
@@ -3999,28 +4892,62 @@ class TrashManager(tk.Toplevel):
         ttk.Button(btn_frame, text="閉じる", command=self.destroy, style="Dialog.TButton").grid(row=0, column=2, padx=4)
 
     def _load_trash_list(self) -> None:
-        self.listbox.delete(0, tk.END)
+        """まずファイル名だけで一覧を出し、フロー名は _resolve_trash_names で後から埋める。"""
+        self._cancel_resolve()
         self._files.clear()
 
         if not self.trash_dir.exists():
+            self._trash_listvar.set(())
+            return
+
+        # DirEntry は名前を持っているので、絞り込みと並べ替えに Path は作らない
+        with os.scandir(self.trash_dir) as it:
+            yaml_entries = sorted(
+                (e for e in it if e.name.endswith(".yaml") and e.is_file()),
+                key=lambda e: e.name,
+            )
+        self._files.extend(Path(e.path) for e in yaml_entries)
+        if not self._files:
+            self._trash_listvar.set(("[ゴミ箱は空です]",))
             return
 
-        yaml_files = sorted(self.trash_dir.glob("*.yaml"))
-        for p in yaml_files:
-            display = p.name
+        self._trash_listvar.set(tuple(p.name for p in self._files))
+        self._resolve_after_id = self.after_idle(self._resolve_trash_names, 0)
+
+    def _resolve_trash_names(self, start: int) -> None:
+        """start 行目から少しずつフロー名を読み、一覧の表示を「name (ファイル名)」に差し替える。"""
+        self._resolve_after_id = None
+        end = min(start + _TRASH_NAME_BATCH, len(self._files))
+        for i in range(start, end):
+            p = self._files[i]
+            try:
+                name = _read_flow_name(p)
+            except Exception:
+                continue
+            if not name:
+                continue
+            selected = self.listbox.selection_includes(i)
+            self.listbox.delete(i)
+            self.listbox.insert(i, f"{name} ({p.name})")
+            if selected:
+                self.listbox.selection_set(i)
+
+        if end < len(self._files):
+            # 1回に読む件数を抑えて、その間も操作できるようにする
+            self._resolve_after_id = self.after_idle(self._resolve_trash_names, end)
+
+    def _cancel_resolve(self) -> None:
+        if self._resolve_after_id is not None:
             try:
-                with p.open("r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f) or {}
-                if isinstance(data, dict) and data.get("name"):
-                    display = f"{data['name']} ({p.name})"
+                self.after_cancel(self._resolve_after_id)
             except Exception:
                 pass
+            self._resolve_after_id = None
 
-            self._files.append(p)
-            self.listbox.insert(tk.END, display)
-
-        if not self._files:
-            self.listbox.insert(tk.END, "[ゴミ箱は空です]")
+    def destroy(self) -> None:
+        # 閉じた後に名前解決のコールバックが残らないように止める
+        self._cancel_resolve()
+        super().destroy()
 
     def _get_selected_path(self) -> Optional[Path]:
         if not self._files: